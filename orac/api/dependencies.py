@@ -149,7 +149,7 @@ async def cleanup_dependencies():
     if _client:
         try:
             logger.info("Cleaning up llama.cpp client")
-            await _client.cleanup()
+            await _client.aclose()
         except Exception as e:
             logger.error(f"Error cleaning up client: {e}")
 
@@ -5,6 +5,7 @@ Home Assistant specific endpoints for cache management.
 """
 
 import os
+import asyncio
 from fastapi import APIRouter, HTTPException
 from typing import Dict, Any
 
@@ -30,17 +31,14 @@ async def create_homeassistant_cache() -> Dict[str, Any]:
 
         # Create client and fetch data to trigger cache
         async with HomeAssistantClient(config) as client:
-            # Fetch entities
-            logger.info("Fetching entities...")
-            entities = await client.get_states(use_cache=False)  # Force fresh fetch
-
-            # Fetch services
-            logger.info("Fetching services...")
-            services = await client.get_services(use_cache=False)  # Force fresh fetch
-
-            # Fetch areas
-            logger.info("Fetching areas...")
-            areas = await client.get_areas(use_cache=False)  # Force fresh fetch
+            # Fetch entities, services and areas. The requests are independent,
+            # so issue them concurrently (forcing fresh fetches)
+            logger.info("Fetching entities, services and areas...")
+            entities, services, areas = await asyncio.gather(
+                client.get_states(use_cache=False),
+                client.get_services(use_cache=False),
+                client.get_areas(use_cache=False)
+            )
 
             # Get cache stats
             cache_stats = client.get_cache_stats()
@@ -6,6 +6,7 @@ System status and health endpoints.
 
 import os
 import json
+import time
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Dict, Any, Optional, List
@@ -13,7 +14,7 @@ from datetime import datetime
 from pathlib import Path
 
 from orac.logger import get_logger
-from orac.config import APIConfig
+from orac.config import APIConfig, CacheConfig
 from orac.api.dependencies import get_client, get_last_command_storage
 
 logger = get_logger(__name__)
@@ -23,6 +24,9 @@ router = APIRouter(tags=["System"])
 # Performance log file path
 PERFORMANCE_LOG_PATH = Path(os.getenv("DATA_DIR", "/app/data")) / "performance_log.json"
 
+# Model count served by /v1/status as (monotonic time computed, count)
+_status_models_cache: Optional[tuple] = None
+
 
 class PerformanceEntry(BaseModel):
     """A single performance measurement entry."""
@@ -84,12 +88,20 @@ async def health_check() -> Dict[str, Any]:
 @router.get("/v1/status")
 async def get_status() -> Dict[str, Any]:
     """Get system status."""
+    global _status_models_cache
     try:
-        client = await get_client()
-        models = await client.list_models()
+        # Reuse a recent model count so polling doesn't rescan the models dir
+        now = time.monotonic()
+        if _status_models_cache and now - _status_models_cache[0] < CacheConfig.STATUS_CACHE_TTL:
+            models_available = _status_models_cache[1]
+        else:
+            client = await get_client()
+            models_available = len(await client.list_models())
+            _status_models_cache = (now, models_available)
+
         return {
             "status": "ok",
-            "models_available": len(models),
+            "models_available": models_available,
             "version": APIConfig.VERSION
         }
     except Exception as e:
@@ -920,7 +920,7 @@ async def shutdown_event():
     global client, ha_client
     if client:
         try:
-            await client.cleanup()
+            await client.aclose()
         except Exception as e:
             logger.error(f"Error during shutdown: {e}")
     
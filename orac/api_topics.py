@@ -317,7 +317,7 @@ async def get_topic_grammar_options(topic_id: str):
     """
     import re
     import os
-    from orac.backend_grammar_generator import BackendGrammarGenerator
+    from orac.backend_grammar_generator import BackendGrammarGenerator, expand_alternation
 
     try:
         # Get the topic
@@ -346,20 +346,20 @@ async def get_topic_grammar_options(topic_id: str):
         # Parse device ::= "option1" | "option2" | ...
         device_match = re.search(r'device\s*::=\s*(.+?)(?:\n|$)', content)
         if device_match:
-            devices = re.findall(r'"([^"]+)"', device_match.group(1))
-            options["devices"] = [d for d in devices if d != "UNKNOWN"]
+            devices = expand_alternation(device_match.group(1))
+            options["devices"] = [d for d in devices if d and d != "UNKNOWN"]
 
         # Parse location ::= "option1" | "option2" | ...
         location_match = re.search(r'location\s*::=\s*(.+?)(?:\n|$)', content)
         if location_match:
-            locations = re.findall(r'"([^"]+)"', location_match.group(1))
-            options["locations"] = [l for l in locations if l != "UNKNOWN"]
+            locations = expand_alternation(location_match.group(1))
+            options["locations"] = [l for l in locations if l and l != "UNKNOWN"]
 
         # Parse action ::= "option1" | "option2" | ...
         action_match = re.search(r'action\s*::=\s*(.+?)(?:\n|$)', content)
         if action_match:
-            actions = re.findall(r'"([^"]+)"', action_match.group(1))
-            options["actions"] = [a for a in actions if a != "UNKNOWN"]
+            actions = expand_alternation(action_match.group(1))
+            options["actions"] = [a for a in actions if a and a != "UNKNOWN"]
 
         # Build auto-generated prompt hint
         devices_str = ", ".join(options["devices"]) if options["devices"] else "UNKNOWN"
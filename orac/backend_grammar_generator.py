@@ -11,16 +11,86 @@ everything else.
 """
 
 import os
+import re
 import logging
-from typing import Dict, List, Any, Optional, Set
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Set, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Escapes for values embedded in GBNF string literals
+_GBNF_ESCAPE = str.maketrans({'\\': '\\\\', '"': '\\"'})
+
+# Root rule shared by every generated grammar
+_ROOT_RULE = 'root ::= "{\\"device\\":\\"" device "\\",\\"action\\":\\"" action "\\",\\"location\\":\\"" location "\\"}"'
+
+# Vocabularies larger than this are emitted as a prefix tree so llama.cpp
+# shares common prefixes instead of tracking every alternative per token
+TRIE_ALTERNATION_THRESHOLD = 32
+
+# Trie key marking the end of a value (never a real character key)
+_TRIE_END = ''
+
+# Number of built grammars kept across generator instances
+_GRAMMAR_CACHE_SIZE = 16
+
+# Tokens of an alternation made of string literals and parentheses
+_ALTERNATION_TOKEN_RE = re.compile(r'"(?:\\.|[^"\\])*"|[()|]')
+
+
+def expand_alternation(rule_body: str) -> List[str]:
+    """Expand a GBNF alternation of string literals into its values.
+
+    Accepts both flat alternations ('"a" | "b"') and the nested prefix-tree
+    form produced for large vocabularies ('"bed" ("room" | "side")').
+    Non-terminal references are ignored.
+
+    Args:
+        rule_body: Right-hand side of a GBNF rule
+
+    Returns:
+        Values in the order they appear in the rule
+    """
+    tokens = _ALTERNATION_TOKEN_RE.findall(rule_body)
+    pos = 0
+
+    def parse_alternatives() -> List[str]:
+        nonlocal pos
+        values = parse_sequence()
+        while pos < len(tokens) and tokens[pos] == '|':
+            pos += 1
+            values.extend(parse_sequence())
+        return values
+
+    def parse_sequence() -> List[str]:
+        nonlocal pos
+        prefixes = ['']
+        while pos < len(tokens) and tokens[pos] not in ('|', ')'):
+            if tokens[pos] == '(':
+                pos += 1
+                suffixes = parse_alternatives()
+                pos += 1  # closing parenthesis
+            else:
+                suffixes = [re.sub(r'\\(.)', r'\1', tokens[pos][1:-1])]
+                pos += 1
+            prefixes = [prefix + suffix for prefix in prefixes for suffix in suffixes]
+        return prefixes
+
+    return parse_alternatives()
+
 
 class BackendGrammarGenerator:
     """Generates GBNF grammars from backend device mappings."""
 
+    # Class-level caches, since a generator is created for every backend save.
+    # Built grammars are keyed by template path, vocabularies and template
+    # mtime; action rules by template path and hold the mtime they were read at.
+    _grammar_cache: "OrderedDict[Tuple, str]" = OrderedDict()
+    _action_rules_cache: Dict[str, Tuple[Optional[int], str]] = {}
+    _cache_lock = threading.Lock()
+
     def __init__(self, backend_manager, data_dir: str = None):
         """Initialize the grammar generator.
 
@@ -56,55 +126,75 @@ class BackendGrammarGenerator:
         """
         return self.grammars_dir / f"backend_{backend_id}.gbnf"
 
-    def extract_configured_device_types(self, backend_id: str) -> Set[str]:
-        """Extract unique device types from enabled device mappings.
+    def _extract_vocabularies(self, backend_id: str) -> Tuple[Set[str], Set[str], List[Dict[str, str]]]:
+        """Extract device types, locations and valid combinations in one pass.
+
+        Walks the enabled device mappings once instead of once per
+        vocabulary, which matters when grammar generation, statistics and
+        command testing all need the same three views.
 
         Args:
             backend_id: The backend ID
 
         Returns:
-            Set of configured device types
+            Tuple of (device types, locations, valid device+location combinations)
         """
         device_types = set()
+        locations = set()
+        combinations = []
 
         backend = self.backend_manager.get_backend(backend_id)
         if not backend:
             logger.error(f"Backend {backend_id} not found")
-            return device_types
+            return device_types, locations, combinations
 
         device_mappings = backend.get('device_mappings', {})
 
         for device_id, mapping in device_mappings.items():
-            if mapping.get('enabled') and mapping.get('device_type'):
-                device_types.add(mapping['device_type'])
+            if not mapping.get('enabled'):
+                continue
+
+            device_type = mapping.get('device_type')
+            location = mapping.get('location')
+            if device_type:
+                device_types.add(device_type)
+            if location:
+                locations.add(location)
+            if device_type and location:
+                combinations.append({
+                    'device_id': device_id,
+                    'device_type': device_type,
+                    'location': location,
+                    'original_name': mapping.get('original_name', device_id)
+                })
 
-        logger.info(f"Extracted {len(device_types)} device types: {list(device_types)}")
-        return device_types
+        logger.info(
+            f"Extracted {len(device_types)} device types, {len(locations)} locations "
+            f"and {len(combinations)} valid device+location combinations"
+        )
+        return device_types, locations, combinations
 
-    def extract_configured_locations(self, backend_id: str) -> Set[str]:
-        """Extract unique locations from enabled device mappings.
+    def extract_configured_device_types(self, backend_id: str) -> Set[str]:
+        """Extract unique device types from enabled device mappings.
 
         Args:
             backend_id: The backend ID
 
         Returns:
-            Set of configured locations
+            Set of configured device types
         """
-        locations = set()
-
-        backend = self.backend_manager.get_backend(backend_id)
-        if not backend:
-            logger.error(f"Backend {backend_id} not found")
-            return locations
+        return self._extract_vocabularies(backend_id)[0]
 
-        device_mappings = backend.get('device_mappings', {})
+    def extract_configured_locations(self, backend_id: str) -> Set[str]:
+        """Extract unique locations from enabled device mappings.
 
-        for device_id, mapping in device_mappings.items():
-            if mapping.get('enabled') and mapping.get('location'):
-                locations.add(mapping['location'])
+        Args:
+            backend_id: The backend ID
 
-        logger.info(f"Extracted {len(locations)} locations: {list(locations)}")
-        return locations
+        Returns:
+            Set of configured locations
+        """
+        return self._extract_vocabularies(backend_id)[1]
 
     def get_valid_device_location_combinations(self, backend_id: str) -> List[Dict[str, str]]:
         """Get valid device type + location combinations from device mappings.
@@ -115,28 +205,7 @@ class BackendGrammarGenerator:
         Returns:
             List of valid combinations with device type and location
         """
-        combinations = []
-
-        backend = self.backend_manager.get_backend(backend_id)
-        if not backend:
-            logger.error(f"Backend {backend_id} not found")
-            return combinations
-
-        device_mappings = backend.get('device_mappings', {})
-
-        for device_id, mapping in device_mappings.items():
-            if (mapping.get('enabled') and
-                mapping.get('device_type') and
-                mapping.get('location')):
-                combinations.append({
-                    'device_id': device_id,
-                    'device_type': mapping['device_type'],
-                    'location': mapping['location'],
-                    'original_name': mapping.get('original_name', device_id)
-                })
-
-        logger.info(f"Found {len(combinations)} valid device+location combinations")
-        return combinations
+        return self._extract_vocabularies(backend_id)[2]
 
     def load_default_grammar_template(self) -> str:
         """Load the default.gbnf template to use as base for generation.
@@ -181,28 +250,45 @@ set-temp-action ::= "set " temp'''
         logger.info(f"Generating dynamic grammar for backend {backend_id}")
 
         # Extract configured device types and locations
-        device_types = self.extract_configured_device_types(backend_id)
-        locations = self.extract_configured_locations(backend_id)
-
-        # Ensure we always have UNKNOWN as fallback
-        device_types.add("UNKNOWN")
-        locations.add("UNKNOWN")
+        device_types, locations, _ = self._extract_vocabularies(backend_id)
+        return self._build_grammar(device_types, locations)
 
-        # Load default action rules from template
-        template = self.load_default_grammar_template()
+    def _build_grammar(self, device_types: Set[str], locations: Set[str]) -> str:
+        """Build the GBNF grammar for the given device and location vocabularies.
 
-        # Extract action rules from template (everything after device and location rules)
-        action_rules = self._extract_action_rules_from_template(template)
-
-        # Generate device rule
-        device_rule = "device ::= " + " | ".join(f'"{dt}"' for dt in sorted(device_types))
+        Args:
+            device_types: Configured device types
+            locations: Configured locations
 
-        # Generate location rule
-        location_rule = "location ::= " + " | ".join(f'"{loc}"' for loc in sorted(locations))
+        Returns:
+            Generated GBNF grammar string
+        """
+        # Ensure we always have UNKNOWN as fallback
+        device_types = device_types | {"UNKNOWN"}
+        locations = locations | {"UNKNOWN"}
+
+        # The grammar is a pure function of the vocabularies and the template,
+        # so reuse an earlier result when none of them have changed
+        template_mtime = self._get_template_mtime()
+        cache_key = (str(self.grammars_dir), frozenset(device_types), frozenset(locations), template_mtime)
+        with self._cache_lock:
+            grammar = self._grammar_cache.get(cache_key)
+            if grammar is not None:
+                self._grammar_cache.move_to_end(cache_key)
+                logger.debug("Reusing cached grammar for unchanged vocabularies")
+                return grammar
+
+        # Action rules only depend on the template, so only the device and
+        # location rules below are rebuilt when the vocabularies change
+        action_rules = self._get_action_rules(template_mtime)
+
+        # Generate device and location rules
+        device_rule = "device ::= " + self._generate_alternation(device_types)
+        location_rule = "location ::= " + self._generate_alternation(locations)
 
         # Combine everything
         grammar_lines = [
-            'root ::= "{\\"device\\":\\"" device "\\",\\"action\\":\\"" action "\\",\\"location\\":\\"" location "\\"}"',
+            _ROOT_RULE,
             "",
             device_rule,
             location_rule,
@@ -212,8 +298,107 @@ set-temp-action ::= "set " temp'''
 
         grammar = "\n".join(grammar_lines)
         logger.info(f"Generated grammar with {len(device_types)} device types and {len(locations)} locations")
+
+        with self._cache_lock:
+            self._grammar_cache[cache_key] = grammar
+            if len(self._grammar_cache) > _GRAMMAR_CACHE_SIZE:
+                self._grammar_cache.popitem(last=False)
         return grammar
 
+    def _get_action_rules(self, template_mtime: Optional[int]) -> str:
+        """Get the action rules from the default template.
+
+        Args:
+            template_mtime: Current template mtime from _get_template_mtime
+
+        Returns:
+            Action rules portion of the template
+        """
+        template_key = str(self.grammars_dir)
+        cached = self._action_rules_cache.get(template_key)
+        if cached is None or cached[0] != template_mtime:
+            template = self.load_default_grammar_template()
+            cached = (template_mtime, self._extract_action_rules_from_template(template))
+            self._action_rules_cache[template_key] = cached
+        return cached[1]
+
+    def _get_template_mtime(self) -> Optional[int]:
+        """Get the modification time of the default.gbnf template.
+
+        Returns:
+            Modification time in nanoseconds, or None if the template is missing
+        """
+        try:
+            return os.stat(self.grammars_dir / "default.gbnf").st_mtime_ns
+        except OSError:
+            return None
+
+    def _generate_alternation(self, values: Set[str]) -> str:
+        """Build a sorted GBNF alternation of escaped string literals.
+
+        Vocabularies above TRIE_ALTERNATION_THRESHOLD are emitted as nested
+        alternations over a prefix tree, which matches the same strings.
+
+        Args:
+            values: Values to allow
+
+        Returns:
+            Alternation such as '"a" | "b"', or '"bed" ("room" | "side")'
+            for large vocabularies
+        """
+        if len(values) > TRIE_ALTERNATION_THRESHOLD:
+            return self._serialize_trie(self._build_trie(values))
+        return " | ".join(f'"{value.translate(_GBNF_ESCAPE)}"' for value in sorted(values))
+
+    def _build_trie(self, values: Set[str]) -> Dict[str, Dict]:
+        """Build a character trie of the given values.
+
+        Args:
+            values: Values to insert
+
+        Returns:
+            Nested dict keyed by character, with _TRIE_END marking value ends
+        """
+        root: Dict[str, Dict] = {}
+        for value in values:
+            node = root
+            for char in value:
+                node = node.setdefault(char, {})
+            node[_TRIE_END] = {}
+        return root
+
+    def _serialize_trie(self, node: Dict[str, Dict]) -> str:
+        """Serialize a trie node as a GBNF alternation.
+
+        Chains of single-child nodes are collapsed into one literal so the
+        output stays compact.
+
+        Args:
+            node: Trie node from _build_trie
+
+        Returns:
+            GBNF alternation matching every value below the node
+        """
+        branches = []
+        for char in sorted(node):
+            if char == _TRIE_END:
+                branches.append('""')
+                continue
+
+            prefix = char
+            child = node[char]
+            while len(child) == 1 and _TRIE_END not in child:
+                (next_char, child), = child.items()
+                prefix += next_char
+
+            literal = f'"{prefix.translate(_GBNF_ESCAPE)}"'
+            if list(child) == [_TRIE_END]:
+                branches.append(literal)
+            else:
+                branches.append(f"{literal} ({self._serialize_trie(child)})")
+
+        return " | ".join(branches)
+
     def _extract_action_rules_from_template(self, template: str) -> str:
         """Extract action-related rules from the grammar template.
 
@@ -237,6 +422,49 @@ set-temp-action ::= "set " temp'''
 
         return "\n".join(action_lines)
 
+    def _grammar_file_is_current(self, grammar_file: Path, grammar: str) -> bool:
+        """Check whether a grammar file already holds the given grammar.
+
+        The file size is compared first so a changed grammar is usually
+        detected with a single stat call.
+
+        Args:
+            grammar_file: Path to the grammar file
+            grammar: Grammar content to compare against
+
+        Returns:
+            True if the file exists and its content matches
+        """
+        try:
+            if grammar_file.stat().st_size != len(grammar.encode()):
+                return False
+            return grammar_file.read_text() == grammar
+        except OSError:
+            return False
+
+    def _write_grammar_file(self, grammar_file: Path, grammar: str) -> None:
+        """Atomically write a grammar file.
+
+        The grammar is written to a temporary file next to the target and
+        then moved into place with os.replace, so a crash mid-write never
+        leaves llama-server with a truncated grammar.
+
+        Args:
+            grammar_file: Destination path for the grammar
+            grammar: Grammar content to write
+        """
+        tmp_file = grammar_file.with_name(grammar_file.name + '.tmp')
+        try:
+            with open(tmp_file, 'w') as f:
+                f.write(grammar)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, grammar_file)
+        except Exception:
+            if tmp_file.exists():
+                tmp_file.unlink()
+            raise
+
     def generate_and_save_grammar(self, backend_id: str) -> Dict[str, Any]:
         """Generate and save grammar for a backend.
 
@@ -255,25 +483,28 @@ set-temp-action ::= "set " temp'''
                     "error": f"Backend {backend_id} not found"
                 }
 
+            # Extract vocabularies once for both the grammar and statistics
+            device_types, locations, combinations = self._extract_vocabularies(backend_id)
+
             # Generate grammar. With no enabled devices, this still writes a
             # valid grammar containing only UNKNOWN — the LLM is constrained
             # away from stale leftover values.
-            grammar = self.generate_dynamic_grammar(backend_id)
+            logger.info(f"Generating dynamic grammar for backend {backend_id}")
+            grammar = self._build_grammar(device_types, locations)
 
-            # Save to file
+            # Save to file, leaving an identical grammar untouched so its
+            # mtime stays stable for readers that cache by modification time
             grammar_file = self.get_grammar_file_path(backend_id)
-            with open(grammar_file, 'w') as f:
-                f.write(grammar)
-
-            # Get statistics
-            device_types = self.extract_configured_device_types(backend_id)
-            locations = self.extract_configured_locations(backend_id)
-            combinations = self.get_valid_device_location_combinations(backend_id)
-
-            logger.info(f"Generated and saved grammar for backend {backend_id} to {grammar_file}")
+            changed = not self._grammar_file_is_current(grammar_file, grammar)
+            if changed:
+                self._write_grammar_file(grammar_file, grammar)
+                logger.info(f"Generated and saved grammar for backend {backend_id} to {grammar_file}")
+            else:
+                logger.info(f"Grammar for backend {backend_id} unchanged, keeping {grammar_file}")
 
             return {
                 "success": True,
+                "changed": changed,
                 "grammar_file": str(grammar_file),
                 "grammar_content": grammar,
                 "statistics": {
@@ -317,9 +548,7 @@ set-temp-action ::= "set " temp'''
             # In a full implementation, this would use a proper GBNF parser
 
             # Get valid device types and locations
-            device_types = self.extract_configured_device_types(backend_id)
-            locations = self.extract_configured_locations(backend_id)
-            combinations = self.get_valid_device_location_combinations(backend_id)
+            device_types, locations, combinations = self._extract_vocabularies(backend_id)
 
             # Simple heuristic validation
             command_lower = command.lower()
@@ -420,8 +649,7 @@ set-temp-action ::= "set " temp'''
             enabled_devices = [m for m in device_mappings.values() if m.get('enabled')]
             mapped_devices = [m for m in enabled_devices if m.get('device_type') and m.get('location')]
 
-            device_types = self.extract_configured_device_types(backend_id)
-            locations = self.extract_configured_locations(backend_id)
+            device_types, locations, _ = self._extract_vocabularies(backend_id)
 
             status = {
                 "backend_exists": True,
@@ -18,6 +18,15 @@ from orac.backends.abstract_backend import AbstractBackend
 
 logger = logging.getLogger(__name__)
 
+# Initial device type suggested for newly discovered entities, by HA domain
+_SUGGESTED_DEVICE_TYPES = {
+    'light': 'lights',
+    'climate': 'heating',
+    'media_player': 'media_player',
+    'cover': 'blinds',
+    'switch': 'switches',  # Could be lights or switches
+}
+
 
 class BackendType(Enum):
     HOMEASSISTANT = "homeassistant"
@@ -113,7 +122,11 @@ class BackendManager:
                 grammar_generator = BackendGrammarGenerator(self, str(self.data_dir))
                 logger.info(f"Auto-regenerating grammar for backend {backend_id} after device changes")
                 result = grammar_generator.generate_and_save_grammar(backend_id)
-                if result["success"]:
+                if result["success"] and not result["changed"]:
+                    # Status or statistics-only saves leave the grammar as it
+                    # was, so the running llama-server is still current
+                    logger.info(f"Grammar for backend {backend_id} unchanged, keeping llama-server")
+                elif result["success"]:
                     logger.info(f"Grammar regenerated successfully for backend {backend_id}")
                     # Drop running llama-server KV cache so the model's conditioning
                     # doesn't lag behind the on-disk grammar. Next generation request
@@ -605,67 +618,58 @@ class BackendManager:
                 if 'locations' not in backend:
                     backend['locations'] = []
 
-                # Extract areas as locations
-                areas_found = set()
+                # Set mirror of the location list for O(1) membership checks
+                locations = backend['locations']
+                known_locations = set(locations)
+                device_mappings = backend['device_mappings']
+
+                # Collect areas as locations and update or add device mappings
+                # in a single pass over the entities
                 for entity in entities:
-                    area = entity.get('attributes', {}).get('area')
-                    if area and area != 'Unknown':
-                        areas_found.add(area)
+                    attributes = entity.get('attributes', {})
 
-                # Add areas as locations if not already present
-                for area in areas_found:
-                    if area not in backend['locations']:
-                        backend['locations'].append(area)
+                    # Add the entity's area as a location if not already present
+                    area = attributes.get('area')
+                    if area and area != 'Unknown' and area not in known_locations:
+                        known_locations.add(area)
+                        locations.append(area)
 
-                # Update or add device mappings
-                for entity in entities:
                     entity_id = entity.get('entity_id')
                     if entity_id:
+                        original_area = attributes.get('area', 'Unknown')
+                        original_name = attributes.get('friendly_name', entity_id)
+
                         # Preserve existing mapping if it exists
-                        if entity_id in backend['device_mappings']:
+                        existing = device_mappings.get(entity_id)
+                        if existing is not None:
                             # Update original area if changed
-                            backend['device_mappings'][entity_id]['original_area'] = entity.get('attributes', {}).get('area', 'Unknown')
-                            backend['device_mappings'][entity_id]['original_name'] = entity.get('attributes', {}).get('friendly_name', entity_id)
-                            backend['device_mappings'][entity_id]['state'] = entity.get('state')
-                            backend['device_mappings'][entity_id]['attributes'] = entity.get('attributes', {})
+                            existing['original_area'] = original_area
+                            existing['original_name'] = original_name
+                            existing['state'] = entity.get('state')
+                            existing['attributes'] = attributes
                         else:
                             # Create new device mapping
-                            domain = entity_id.split('.')[0] if '.' in entity_id else 'unknown'
+                            domain, sep, _ = entity_id.partition('.')
+                            if not sep:
+                                domain = 'unknown'
 
                             # Suggest initial device type based on domain
-                            suggested_type = None
-                            if domain == 'light':
-                                suggested_type = 'lights'
-                            elif domain == 'climate':
-                                suggested_type = 'heating'
-                            elif domain == 'media_player':
-                                suggested_type = 'media_player'
-                            elif domain == 'cover':
-                                suggested_type = 'blinds'
-                            elif domain == 'switch':
-                                # Could be lights or switches
-                                suggested_type = 'switches'
-
-                            backend['device_mappings'][entity_id] = {
+                            suggested_type = _SUGGESTED_DEVICE_TYPES.get(domain)
+
+                            device_mappings[entity_id] = {
                                 'enabled': False,
                                 'device_type': suggested_type,
                                 'location': None,
-                                'original_area': entity.get('attributes', {}).get('area', 'Unknown'),
-                                'original_name': entity.get('attributes', {}).get('friendly_name', entity_id),
+                                'original_area': original_area,
+                                'original_name': original_name,
                                 'domain': domain,
                                 'configured_at': None,
                                 'state': entity.get('state'),
-                                'attributes': entity.get('attributes', {})
+                                'attributes': attributes
                             }
 
                 # Update statistics
-                backend['statistics'] = {
-                    'total_devices': len(backend['device_mappings']),
-                    'enabled_devices': sum(1 for d in backend['device_mappings'].values() if d['enabled']),
-                    'mapped_devices': sum(1 for d in backend['device_mappings'].values()
-                                        if d['enabled'] and d.get('device_type') and d.get('location')),
-                    'last_sync': datetime.now().isoformat()
-                }
+                self._refresh_device_statistics(backend, last_sync=datetime.now().isoformat())
 
                 self.save_backend(backend_id)
 
@@ -715,8 +719,19 @@ class BackendManager:
             return None
 
         mapping = backend['device_mappings'][device_id]
+        self._apply_device_mapping_updates(mapping, updates)
 
-        # Update allowed fields
+        self._refresh_device_statistics(backend)
+        self.save_backend(backend_id)
+        return mapping
+
+    def _apply_device_mapping_updates(self, mapping: Dict, updates: Dict) -> None:
+        """Apply the user-editable fields of an update to a device mapping
+
+        Args:
+            mapping: The device mapping to modify in place
+            updates: Dictionary of updates
+        """
         if 'enabled' in updates:
             mapping['enabled'] = updates['enabled']
             if updates['enabled'] and not mapping.get('configured_at'):
@@ -728,18 +743,31 @@ class BackendManager:
         if 'location' in updates:
             mapping['location'] = updates['location']
 
-        # Update statistics
+    def _refresh_device_statistics(self, backend: Dict, last_sync: Optional[str] = None) -> None:
+        """Recompute a backend's device statistics from its mappings
+
+        Args:
+            backend: The backend configuration to update in place
+            last_sync: New sync timestamp, or None to keep the current one
+        """
+        if last_sync is None:
+            last_sync = backend['statistics'].get('last_sync')
+
+        enabled_devices = 0
+        mapped_devices = 0
+        for d in backend['device_mappings'].values():
+            if d['enabled']:
+                enabled_devices += 1
+                if d.get('device_type') and d.get('location'):
+                    mapped_devices += 1
+
         backend['statistics'] = {
             'total_devices': len(backend['device_mappings']),
-            'enabled_devices': sum(1 for d in backend['device_mappings'].values() if d['enabled']),
-            'mapped_devices': sum(1 for d in backend['device_mappings'].values()
-                                if d['enabled'] and d.get('device_type') and d.get('location')),
-            'last_sync': backend['statistics'].get('last_sync')
+            'enabled_devices': enabled_devices,
+            'mapped_devices': mapped_devices,
+            'last_sync': last_sync
         }
 
-        self.save_backend(backend_id)
-        return mapping
-
     def update_entity(self, backend_id: str, entity_id: str, updates: Dict) -> Optional[Dict]:
         """Legacy method - redirects to update_device_mapping for compatibility"""
         return self.update_device_mapping(backend_id, entity_id, updates)
@@ -763,10 +791,22 @@ class BackendManager:
                 "updated": 0
             }
 
+        device_mappings = backend.setdefault('device_mappings', {})
+
+        # Apply every update first, then recompute statistics and save (which
+        # also regenerates the grammar) once for the whole batch
         updated = 0
         for device_id in device_ids:
-            if self.update_device_mapping(backend_id, device_id, updates):
-                updated += 1
+            mapping = device_mappings.get(device_id)
+            if mapping is None:
+                logger.error(f"Device {device_id} not found in backend {backend_id}")
+                continue
+            self._apply_device_mapping_updates(mapping, updates)
+            updated += 1
+
+        if updated:
+            self._refresh_device_statistics(backend)
+            self.save_backend(backend_id)
 
         return {
             "success": True,
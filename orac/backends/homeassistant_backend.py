@@ -4,15 +4,22 @@ The dispatcher is encapsulated within the backend - users only need to
 configure the backend, not the dispatcher separately.
 """
 
+import asyncio
+import json
 import logging
 from typing import Dict, List, Optional, Any
+from urllib.parse import urlparse
 from .abstract_backend import AbstractBackend
 from orac.config import NetworkConfig
 from orac.homeassistant.client import HomeAssistantClient
+from orac.homeassistant.config import HomeAssistantConfig
 from orac.dispatchers.homeassistant import HomeAssistantDispatcher
 
 logger = logging.getLogger(__name__)
 
+# Fields every Home Assistant command must carry
+_REQUIRED_COMMAND_FIELDS = frozenset({'device', 'action'})
+
 
 class HomeAssistantBackend(AbstractBackend):
     """Home Assistant backend with integrated dispatcher.
@@ -97,9 +104,6 @@ class HomeAssistantBackend(AbstractBackend):
         Returns:
             Configured HomeAssistantClient instance
         """
-        from orac.homeassistant.config import HomeAssistantConfig
-        from urllib.parse import urlparse
-
         ha_config = self.config.get('homeassistant', {})
 
         # Parse URL to get host and port
@@ -217,12 +221,13 @@ class HomeAssistantBackend(AbstractBackend):
 
             # Execute through internal dispatcher
             # Convert dict to JSON string as dispatcher expects JSON string
-            import json
             command_json = json.dumps(command)
             logger.info(f"Executing command through internal dispatcher: {command_json}")
 
-            # Dispatcher.execute is not async, call it directly
-            result = self.dispatcher.execute(command_json, context)
+            # Dispatcher.execute blocks on HTTP calls and a state-propagation
+            # sleep, so run it in a worker thread to keep the event loop free
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(None, self.dispatcher.execute, command_json, context)
 
             # Add backend info to result
             result['backend'] = {
@@ -318,8 +323,7 @@ class HomeAssistantBackend(AbstractBackend):
             True if command is valid
         """
         # Check required fields for Home Assistant commands
-        required_fields = ['device', 'action']
-        if not all(field in command for field in required_fields):
+        if not _REQUIRED_COMMAND_FIELDS.issubset(command):
             logger.warning(f"Command missing required fields: {command}")
             return False
 
@@ -22,6 +22,9 @@ class NetworkConfig:
     MAX_RETRIES = 3
     RETRY_DELAY = 1
 
+    # Maximum concurrent requests per Home Assistant client
+    HA_MAX_CONCURRENT_REQUESTS = 4
+
 
 # Model Configuration
 class ModelConfig:
@@ -59,6 +62,7 @@ class CacheConfig:
     ENTITY_CACHE_TTL = 300
     SERVICE_CACHE_TTL = 600
     GRAMMAR_CACHE_TTL = 3600  # 1 hour
+    STATUS_CACHE_TTL = 5  # /v1/status model count, absorbs UI polling
 
     # STT Response Cache (skip LLM for repeated commands)
     STT_CACHE_MAX_SIZE = 500  # Maximum entries (LRU eviction)
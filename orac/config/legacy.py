@@ -8,7 +8,7 @@ centralized configuration constants.
 import os
 import json
 import yaml
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from orac.logger import get_logger
 from .constants import ModelConfig, PathConfig
 
@@ -19,6 +19,12 @@ DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__
 FAVORITES_PATH = os.path.join(DATA_DIR, "favorites.json")
 MODEL_CONFIGS_PATH = os.path.join(DATA_DIR, "model_configs.yaml")
 
+# libyaml-backed loader when PyYAML was built with it, pure Python otherwise
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# ((mtime_ns, size), parsed config) of the last model_configs.yaml read
+_model_configs_cache: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
+
 # Default configurations
 DEFAULT_FAVORITES = {
     "favorite_models": [],
@@ -168,9 +174,15 @@ def load_model_configs() -> Dict[str, Any]:
     """
     Load model configurations, creating default if missing.
 
+    The parsed file is reused until its modification time or size changes,
+    so per-request callers do not reparse the YAML. The returned dictionary
+    is shared and must not be modified.
+
     Returns:
         Dictionary containing model configurations
     """
+    global _model_configs_cache
+
     ensure_data_dir()
 
     if not os.path.exists(MODEL_CONFIGS_PATH):
@@ -180,8 +192,14 @@ def load_model_configs() -> Dict[str, Any]:
         return DEFAULT_MODEL_CONFIGS
 
     try:
+        stat = os.stat(MODEL_CONFIGS_PATH)
+        file_key = (stat.st_mtime_ns, stat.st_size)
+        if _model_configs_cache is not None and _model_configs_cache[0] == file_key:
+            return _model_configs_cache[1]
+
         with open(MODEL_CONFIGS_PATH, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_YAML_LOADER)
+        _model_configs_cache = (file_key, config)
         return config
     except Exception as e:
         logger.error(f"Error loading model_configs.yaml: {e}")
@@ -225,13 +243,15 @@ def save_model_configs(config: Dict[str, Any]) -> None:
     Args:
         config: Configuration dictionary to save
     """
+    global _model_configs_cache
+
     ensure_data_dir()
     try:
         # Load existing configs
         existing_config = {}
         if os.path.exists(MODEL_CONFIGS_PATH):
             with open(MODEL_CONFIGS_PATH, 'r') as f:
-                existing_config = yaml.safe_load(f) or {}
+                existing_config = yaml.load(f, Loader=_YAML_LOADER) or {}
 
         # Merge new configs with existing ones
         if "models" in config:
@@ -242,6 +262,9 @@ def save_model_configs(config: Dict[str, Any]) -> None:
         # Save merged configs
         with open(MODEL_CONFIGS_PATH, 'w') as f:
             yaml.dump(existing_config, f, default_flow_style=False)
+
+        # Force the next load to reread, even if the rewrite kept mtime and size
+        _model_configs_cache = None
         logger.info("Saved model_configs.yaml")
     except Exception as e:
         logger.error(f"Error saving model_configs.yaml: {e}")
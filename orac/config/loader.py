@@ -18,6 +18,9 @@ from .constants import NetworkConfig, ModelConfig, PathConfig
 
 logger = logging.getLogger(__name__)
 
+# libyaml-backed loader when PyYAML was built with it, pure Python otherwise
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 class ConfigLoader:
     """Unified configuration loader."""
@@ -105,7 +108,7 @@ class ConfigLoader:
 
         try:
             with open(filepath, 'r') as f:
-                return yaml.safe_load(f) or {}
+                return yaml.load(f, Loader=_YAML_LOADER) or {}
         except Exception as e:
             logger.error(f"Failed to load YAML config {filepath}: {e}")
             return {}
@@ -6,12 +6,15 @@ JSON output from the LLM and executing the appropriate actions.
 """
 
 import os
+import copy
 import json
 import time
+import threading
 import requests
 import logging
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 from .base import BaseDispatcher
 from .mapping_resolver import MappingResolver, UnmappedError, InvalidEntityError
 from .mapping_generator import MappingGenerator
@@ -20,6 +23,85 @@ from orac.config import NetworkConfig
 
 logger = logging.getLogger(__name__)
 
+# Services whose repeat within a short window has no further effect, so a
+# duplicate command can be answered from the previous result
+_IDEMPOTENT_SERVICES = frozenset({
+    'turn_on', 'turn_off', 'open_cover', 'close_cover', 'lock', 'unlock'
+})
+_DUPLICATE_WINDOW_SECONDS = 0.5
+_DUPLICATE_CACHE_SIZE = 32
+
+# HTTP session shared by all dispatchers. A dispatcher is created for every
+# command, so the pool has to outlive it for keep-alive connections to be reused
+_SESSION = requests.Session()
+
+# Last successful idempotent command per target:
+# (ha_url, device, location, topic_id) -> (completed at, service, result).
+# Module level for the same reason, and locked since execute() runs in
+# worker threads
+_recent_commands = OrderedDict()
+_recent_commands_lock = threading.Lock()
+
+
+def _get_recent_result(target: Tuple, service: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the result of an identical command that completed very recently.
+
+    Only the latest command to a target is kept, so a hit means nothing else
+    has been sent to that device since.
+
+    Args:
+        target: (ha_url, device, location, topic_id) of the command
+        service: Home Assistant service being called
+
+    Returns:
+        A copy of the previous result, or None if there is none in the window
+    """
+    cutoff = time.monotonic() - _DUPLICATE_WINDOW_SECONDS
+
+    with _recent_commands_lock:
+        # Entries are kept in completion order, so expired ones are at the front
+        while _recent_commands:
+            oldest_target, (completed_at, _, _) = next(iter(_recent_commands.items()))
+            if completed_at >= cutoff:
+                break
+            del _recent_commands[oldest_target]
+
+        entry = _recent_commands.get(target)
+    if entry is None or entry[1] != service:
+        return None
+    return copy.deepcopy(entry[2])
+
+
+def _forget_target(target: Tuple) -> None:
+    """
+    Drop the remembered result for a target a new command is being sent to.
+
+    Args:
+        target: (ha_url, device, location, topic_id) of the command
+    """
+    with _recent_commands_lock:
+        _recent_commands.pop(target, None)
+
+
+def _remember_result(target: Tuple, service: str, result: Dict[str, Any]) -> None:
+    """
+    Record a successful command result for duplicate suppression.
+
+    Replaces whatever was remembered for the target, whatever its service.
+
+    Args:
+        target: (ha_url, device, location, topic_id) of the command
+        service: Home Assistant service that was called
+        result: Result returned for the command
+    """
+    entry = (time.monotonic(), service, copy.deepcopy(result))
+    with _recent_commands_lock:
+        _recent_commands.pop(target, None)
+        _recent_commands[target] = entry
+        if len(_recent_commands) > _DUPLICATE_CACHE_SIZE:
+            _recent_commands.popitem(last=False)
+
 
 class HomeAssistantDispatcher(BaseDispatcher):
     """
@@ -56,6 +138,12 @@ class HomeAssistantDispatcher(BaseDispatcher):
         self.resolver = MappingResolver(self.ha_url, self.ha_token)
         self.generator = MappingGenerator(self.ha_url, self.ha_token)
 
+        # Sent with every request on the shared session
+        self._headers = {
+            'Authorization': f'Bearer {self.ha_token}',
+            'Content-Type': 'application/json'
+        }
+
         # Timing tracking
         self.last_command_timing = {}
     
@@ -111,6 +199,17 @@ class HomeAssistantDispatcher(BaseDispatcher):
                     'error': f'Unknown action: {action}'
                 }
 
+            # Answer an immediate repeat of an idempotent command without
+            # another round-trip to Home Assistant
+            target = (self.ha_url, device, location, topic_id)
+            recent = _get_recent_result(target, service) if service in _IDEMPOTENT_SERVICES else None
+            if recent is not None:
+                logger.info(f"Duplicate command within {_DUPLICATE_WINDOW_SECONDS}s, reusing previous result")
+                return recent
+
+            # This command supersedes whatever was last sent to the target
+            _forget_target(target)
+
             # Try device_mappings from backend config first
             entity_id = None
             mapping_source = "unmapped"
@@ -155,7 +254,7 @@ class HomeAssistantDispatcher(BaseDispatcher):
                 }
 
             # Determine domain from entity_id
-            domain = entity_id.split('.')[0]
+            domain = entity_id.partition('.')[0]
 
             # Record pre-API call timing
             self.last_command_timing['ha_api_call'] = datetime.now().isoformat()
@@ -193,7 +292,7 @@ class HomeAssistantDispatcher(BaseDispatcher):
             # Calculate duration
             duration_ms = (end_time - start_time).total_seconds() * 1000
 
-            return {
+            response = {
                 'success': True,
                 'entity_id': entity_id,
                 'state_changed': state_changed,
@@ -213,6 +312,11 @@ class HomeAssistantDispatcher(BaseDispatcher):
                 'error': None
             }
 
+            if service in _IDEMPOTENT_SERVICES:
+                _remember_result(target, service, response)
+
+            return response
+
         except Exception as e:
             logger.error(f"Error in HomeAssistantDispatcher: {e}")
             return {
@@ -232,13 +336,9 @@ class HomeAssistantDispatcher(BaseDispatcher):
             Entity state dict with 'state' and 'attributes', or None if failed
         """
         url = f"{self.ha_url}/api/states/{entity_id}"
-        headers = {
-            'Authorization': f'Bearer {self.ha_token}',
-            'Content-Type': 'application/json'
-        }
 
         try:
-            response = requests.get(url, headers=headers, timeout=NetworkConfig.HA_TIMEOUT)
+            response = _SESSION.get(url, headers=self._headers, timeout=NetworkConfig.HA_TIMEOUT)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -261,16 +361,12 @@ class HomeAssistantDispatcher(BaseDispatcher):
             Response from Home Assistant
         """
         url = f"{self.ha_url}/api/services/{domain}/{service}"
-        headers = {
-            'Authorization': f'Bearer {self.ha_token}',
-            'Content-Type': 'application/json'
-        }
         data = {
             'entity_id': entity_id
         }
 
         logger.info(f"Calling HA API: {url} with entity: {entity_id}")
-        response = requests.post(url, headers=headers, json=data, timeout=NetworkConfig.HA_TIMEOUT)
+        response = _SESSION.post(url, headers=self._headers, json=data, timeout=NetworkConfig.HA_TIMEOUT)
         response.raise_for_status()
 
         return response.json() if response.text else {'status': 'success'}
@@ -11,6 +11,22 @@ from ..grammars import GBNFParser
 
 logger = logging.getLogger(__name__)
 
+# libyaml-backed loader when PyYAML was built with it, pure Python otherwise
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Entity categories listed in mapping files, keyed by HA domain
+_DOMAIN_CATEGORIES = {
+    'light': 'lights',
+    'switch': 'switches',
+    'climate': 'climate',
+    'cover': 'covers',
+    'sensor': 'sensors',
+    'binary_sensor': 'binary_sensors',
+    'scene': 'scenes',
+    'script': 'scripts',
+    'automation': 'automations'
+}
+
 
 class MappingGenerator:
     """Generates and maintains mapping files between grammar terms and HA entities."""
@@ -25,6 +41,10 @@ class MappingGenerator:
         """
         self.ha_url = ha_url or os.getenv("HA_URL", "http://192.168.8.107:8123")
         self.ha_token = ha_token or os.getenv("HA_TOKEN", "")
+        self._headers = {
+            "Authorization": f"Bearer {self.ha_token}",
+            "Content-Type": "application/json"
+        }
         self.parser = GBNFParser()
         self.mappings_dir = Path(__file__).parent / "mappings"
         self.mappings_dir.mkdir(exist_ok=True)
@@ -69,7 +89,7 @@ class MappingGenerator:
         existing_mappings = {}
         if mapping_file.exists():
             with open(mapping_file, 'r') as f:
-                existing_data = yaml.safe_load(f)
+                existing_data = yaml.load(f, Loader=_YAML_LOADER)
                 if existing_data and 'mappings' in existing_data:
                     existing_mappings = existing_data['mappings']
 
@@ -116,31 +136,16 @@ class MappingGenerator:
         Returns:
             Dictionary categorized by entity type
         """
-        entities = {
-            'lights': [],
-            'switches': [],
-            'climate': [],
-            'covers': [],
-            'sensors': [],
-            'binary_sensors': [],
-            'scenes': [],
-            'scripts': [],
-            'automations': []
-        }
+        entities = {category: [] for category in _DOMAIN_CATEGORIES.values()}
 
         if not self.ha_token:
             logger.warning("No HA token configured, returning empty entity list")
             return entities
 
         try:
-            headers = {
-                "Authorization": f"Bearer {self.ha_token}",
-                "Content-Type": "application/json"
-            }
-
             response = requests.get(
                 f"{self.ha_url}/api/states",
-                headers=headers,
+                headers=self._headers,
                 timeout=10
             )
 
@@ -149,27 +154,11 @@ class MappingGenerator:
 
                 for state in states:
                     entity_id = state['entity_id']
-                    domain = entity_id.split('.')[0]
-
-                    # Categorize by domain
-                    if domain == 'light':
-                        entities['lights'].append(entity_id)
-                    elif domain == 'switch':
-                        entities['switches'].append(entity_id)
-                    elif domain == 'climate':
-                        entities['climate'].append(entity_id)
-                    elif domain == 'cover':
-                        entities['covers'].append(entity_id)
-                    elif domain == 'sensor':
-                        entities['sensors'].append(entity_id)
-                    elif domain == 'binary_sensor':
-                        entities['binary_sensors'].append(entity_id)
-                    elif domain == 'scene':
-                        entities['scenes'].append(entity_id)
-                    elif domain == 'script':
-                        entities['scripts'].append(entity_id)
-                    elif domain == 'automation':
-                        entities['automations'].append(entity_id)
+
+                    # Categorize by domain with a single table lookup
+                    category = _DOMAIN_CATEGORIES.get(entity_id.partition('.')[0])
+                    if category:
+                        entities[category].append(entity_id)
 
                 logger.info(f"Fetched {sum(len(v) for v in entities.values())} entities from HA")
             else:
@@ -196,7 +185,7 @@ class MappingGenerator:
 
         # Load existing mapping
         with open(mapping_file, 'r') as f:
-            mapping_data = yaml.safe_load(f)
+            mapping_data = yaml.load(f, Loader=_YAML_LOADER)
 
         # Fetch current HA entities
         current_entities = self.fetch_ha_entities()
@@ -236,8 +225,8 @@ class MappingGenerator:
         new_entities = {}
 
         for category, current_list in current.items():
-            stored_list = stored.get(category, [])
-            new_items = [e for e in current_list if e not in stored_list]
+            stored_set = set(stored.get(category) or ())
+            new_items = [e for e in current_list if e not in stored_set]
 
             if new_items:
                 new_entities[category] = new_items
@@ -316,9 +305,10 @@ class MappingGenerator:
             for category, entities in ha_entities.items():
                 if entities:
                     lines.append(f"  {category}:")
+                    new_in_category = set(new_entities.get(category, ())) if new_entities else set()
                     for entity in sorted(entities):
                         # Mark new entities
-                        if new_entities and entity in new_entities.get(category, []):
+                        if entity in new_in_category:
                             lines.append(f"    - {entity}  # NEW")
                         else:
                             lines.append(f"    - {entity}")
@@ -349,7 +339,7 @@ class MappingGenerator:
             return results
 
         with open(mapping_file, 'r') as f:
-            mapping_data = yaml.safe_load(f)
+            mapping_data = yaml.load(f, Loader=_YAML_LOADER)
 
         if not mapping_data:
             logger.error(f"Empty or invalid mapping file: {mapping_file}")
@@ -1,15 +1,63 @@
 """Mapping resolver for entity resolution from grammar terms to HA entities."""
 
 import os
+import time
 import yaml
 import logging
 import requests
 from pathlib import Path
 from typing import Dict, Optional, Tuple, List
-from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# libyaml-backed loader when PyYAML was built with it, pure Python otherwise
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Grammar actions that map to a differently named HA service
+_ACTION_TO_SERVICE = {
+    'on': 'turn_on',
+    'off': 'turn_off',
+    'toggle': 'toggle',
+    'open': 'open_cover',
+    'close': 'close_cover',
+    'stop': 'stop_cover',
+    'lock': 'lock',
+    'unlock': 'unlock'
+}
+
+# Parsed mapping files shared by all resolvers, keyed by path and
+# holding the file mtime they were loaded at plus the combination index
+_MAPPING_FILE_CACHE: Dict[str, Tuple[int, Dict, Dict[Tuple[str, str], Tuple[str, str]]]] = {}
+
+
+def _index_combinations(mapping_data: Optional[Dict]) -> Dict[Tuple[str, str], Tuple[str, str]]:
+    """
+    Flatten a mapping file into a single (location, device) lookup.
+
+    Keys written as "location|device" take precedence over the alternate
+    "device|location" order, matching the lookup order of resolve().
+
+    Args:
+        mapping_data: Parsed mapping file
+
+    Returns:
+        Dictionary mapping (location, device) to (mapping key, entity)
+    """
+    mappings = (mapping_data or {}).get('mappings') or {}
+    index = {}
+
+    for key, entity in mappings.items():
+        first, sep, second = key.partition('|')
+        if sep:
+            index[(first, second)] = (key, entity)
+
+    for key, entity in mappings.items():
+        first, sep, second = key.partition('|')
+        if sep:
+            index.setdefault((second, first), (key, entity))
+
+    return index
+
 
 class UnmappedError(Exception):
     """Raised when a combination has no mapping."""
@@ -40,10 +88,13 @@ class MappingResolver:
         """
         self.ha_url = ha_url or os.getenv("HA_URL", "http://192.168.8.107:8123")
         self.ha_token = ha_token or os.getenv("HA_TOKEN", "")
+        self._headers = {
+            "Authorization": f"Bearer {self.ha_token}",
+            "Content-Type": "application/json"
+        }
         self.cache_ttl = cache_ttl
 
-        # Caches
-        self.mapping_cache = {}
+        # Caches (mapping files are cached at module level)
         self.entity_cache = {}
         self.entity_cache_time = None
 
@@ -60,29 +111,47 @@ class MappingResolver:
         Returns:
             Mapping data dictionary
         """
-        # Check cache first
-        if topic_id in self.mapping_cache:
-            return self.mapping_cache[topic_id]
+        entry = self._load_cache_entry(topic_id)
+        return entry[1] if entry else {}
+
+    def _load_cache_entry(self, topic_id: str) -> Optional[Tuple[int, Dict, Dict]]:
+        """
+        Load the cached (mtime, mapping data, combination index) for a topic.
+
+        Args:
+            topic_id: Topic identifier
 
+        Returns:
+            Cache entry, or None if the file is missing or unreadable
+        """
         mapping_file = self.mappings_dir / f"topic_{topic_id}.yaml"
 
-        if not mapping_file.exists():
+        try:
+            mtime = mapping_file.stat().st_mtime_ns
+        except OSError:
             logger.error(f"Mapping file not found for topic {topic_id}: {mapping_file}")
-            return {}
+            return None
+
+        # Reuse the parsed file until it changes on disk
+        cache_key = str(mapping_file)
+        cached = _MAPPING_FILE_CACHE.get(cache_key)
+        if cached and cached[0] == mtime:
+            return cached
 
         try:
             with open(mapping_file, 'r') as f:
-                mapping_data = yaml.safe_load(f)
+                mapping_data = yaml.load(f, Loader=_YAML_LOADER)
 
-            # Cache the loaded mapping
-            self.mapping_cache[topic_id] = mapping_data
+            # Cache the loaded mapping along with its flattened lookup
+            entry = (mtime, mapping_data, _index_combinations(mapping_data))
+            _MAPPING_FILE_CACHE[cache_key] = entry
             logger.info(f"Loaded mapping file for topic {topic_id}")
 
-            return mapping_data
+            return entry
 
         except Exception as e:
             logger.error(f"Error loading mapping file: {e}")
-            return {}
+            return None
 
     def resolve(
         self,
@@ -106,26 +175,17 @@ class MappingResolver:
             InvalidEntityError: If entity doesn't exist in HA
         """
         # Load mappings for topic
-        mapping_data = self.load_mapping_file(topic_id)
+        entry = self._load_cache_entry(topic_id)
 
-        if not mapping_data:
+        if not entry or not entry[1]:
             raise UnmappedError(f"No mapping data available for topic {topic_id}")
 
-        mappings = mapping_data.get('mappings', {}) if mapping_data else {}
-
-        # Create combination key
-        key = f"{location}|{device}"
-
-        # Check if combination exists in mappings
-        if key not in mappings:
-            # Try alternate formats
-            alt_key = f"{device}|{location}"
-            if alt_key in mappings:
-                key = alt_key
-            else:
-                raise UnmappedError(f"No mapping found for {key}")
+        # Single lookup covering both "location|device" and "device|location"
+        found = entry[2].get((location, device))
+        if found is None:
+            raise UnmappedError(f"No mapping found for {location}|{device}")
 
-        mapping = mappings[key]
+        key, mapping = found
 
         # Handle special cases
         if mapping == "":
@@ -193,26 +253,20 @@ class MappingResolver:
         if self.entity_cache_time is None:
             return True
 
-        age = datetime.now() - self.entity_cache_time
-        return age > timedelta(seconds=self.cache_ttl)
+        return time.monotonic() - self.entity_cache_time > self.cache_ttl
 
     def _update_entity_cache(self):
         """Update the entity cache from Home Assistant."""
         if not self.ha_token:
             logger.warning("No HA token, skipping entity validation")
             self.entity_cache = {}
-            self.entity_cache_time = datetime.now()
+            self.entity_cache_time = time.monotonic()
             return
 
         try:
-            headers = {
-                "Authorization": f"Bearer {self.ha_token}",
-                "Content-Type": "application/json"
-            }
-
             response = requests.get(
                 f"{self.ha_url}/api/states",
-                headers=headers,
+                headers=self._headers,
                 timeout=10
             )
 
@@ -222,7 +276,7 @@ class MappingResolver:
                     state['entity_id']: state
                     for state in states
                 }
-                self.entity_cache_time = datetime.now()
+                self.entity_cache_time = time.monotonic()
                 logger.debug(f"Updated entity cache with {len(self.entity_cache)} entities")
             else:
                 logger.error(f"Failed to fetch entities: {response.status_code}")
@@ -327,18 +381,7 @@ class MappingResolver:
         Returns:
             HA service name
         """
-        action_map = {
-            'on': 'turn_on',
-            'off': 'turn_off',
-            'toggle': 'toggle',
-            'open': 'open_cover',
-            'close': 'close_cover',
-            'stop': 'stop_cover',
-            'lock': 'lock',
-            'unlock': 'unlock'
-        }
-
-        return action_map.get(action, action)
+        return _ACTION_TO_SERVICE.get(action, action)
 
     def clear_cache(self, topic_id: Optional[str] = None):
         """
@@ -348,10 +391,10 @@ class MappingResolver:
             topic_id: Specific topic to clear, or None for all
         """
         if topic_id:
-            self.mapping_cache.pop(topic_id, None)
+            _MAPPING_FILE_CACHE.pop(str(self.mappings_dir / f"topic_{topic_id}.yaml"), None)
             logger.info(f"Cleared cache for topic {topic_id}")
         else:
-            self.mapping_cache.clear()
+            _MAPPING_FILE_CACHE.clear()
             self.entity_cache.clear()
             self.entity_cache_time = None
             logger.info("Cleared all caches")
@@ -7,6 +7,22 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Heuristic vocabulary that plain-text output may use for each rule type
+_COMMON_VALUES = {
+    'device': {'lights', 'heating', 'blinds', 'music', 'alarm', 'door', 'window'},
+    'location': {'bedroom', 'kitchen', 'lounge', 'bathroom', 'hall', 'garage', 'office'},
+    'action': {'on', 'off', 'toggle', 'set', 'increase', 'decrease', 'open', 'close'}
+}
+
+# One case-insensitive scan per rule type, matching whole whitespace-separated words
+_COMMON_VALUE_PATTERNS = {
+    rule_name: re.compile(
+        r'(?<!\S)(?:' + '|'.join(map(re.escape, sorted(values))) + r')(?!\S)',
+        re.IGNORECASE
+    )
+    for rule_name, values in _COMMON_VALUES.items()
+}
+
 
 class GBNFParser:
     """Parser for GBNF (GGML BNF) grammar files to extract vocabulary."""
@@ -201,15 +217,16 @@ class GBNFParser:
             return True, None
 
         except json.JSONDecodeError:
-            # Not JSON, validate as plain text
-            words = output.lower().split()
-
+            # Not JSON, validate as plain text.
             # Check if any constrained terms are violated
             for rule_name, allowed_values in grammar.items():
-                for word in words:
-                    if word in self._get_all_possible_values(rule_name):
-                        if word not in allowed_values:
-                            return False, f"Invalid {rule_name}: '{word}'"
+                pattern = _COMMON_VALUE_PATTERNS.get(rule_name)
+                if pattern is None:
+                    continue
+                for match in pattern.finditer(output):
+                    word = match.group(0).lower()
+                    if word not in allowed_values:
+                        return False, f"Invalid {rule_name}: '{word}'"
 
             return True, None
 
@@ -219,13 +236,7 @@ class GBNFParser:
 
         This is a heuristic based on common patterns.
         """
-        common_values = {
-            'device': {'lights', 'heating', 'blinds', 'music', 'alarm', 'door', 'window'},
-            'location': {'bedroom', 'kitchen', 'lounge', 'bathroom', 'hall', 'garage', 'office'},
-            'action': {'on', 'off', 'toggle', 'set', 'increase', 'decrease', 'open', 'close'}
-        }
-
-        return common_values.get(rule_name, set())
+        return _COMMON_VALUES.get(rule_name, set())
 
 
 def test_parser():
@@ -18,7 +18,7 @@ import time
 import json
 import os
 import sys
-from typing import Any, Dict, Optional, List, Set
+from typing import Any, Dict, Optional, List, Set, Tuple
 from pathlib import Path
 from loguru import logger
 
@@ -60,6 +60,13 @@ class HomeAssistantCache:
     SYSTEM_ENTITIES = {
         'sun', 'zone', 'conversation', 'weather', 'tts', 'todo', 'person'
     }
+
+    # All cacheable entity domains folded into one set, so relevance is a
+    # single lookup per entity instead of a chain of membership tests
+    _RELEVANT_ENTITY_DOMAINS = frozenset(
+        (USER_CONTROLLABLE_ENTITIES | INPUT_HELPERS | AUTOMATION_ENTITIES | STATUS_ENTITIES)
+        - SYSTEM_ENTITIES
+    )
     
     def __init__(self, ttl: int = CacheConfig.DEFAULT_TTL, max_size: int = CacheConfig.MAX_CACHE_SIZE, cache_dir: Optional[Path] = None):
         """Initialize the cache with TTL and size limits.
@@ -74,6 +81,10 @@ class HomeAssistantCache:
         self._max_size = max_size
         self._cache_dir = cache_dir
         
+        # Bumped on every mutation so get_version() can reuse its last result
+        self._generation = 0
+        self._version_cache: Optional[Tuple[int, str]] = None
+        
         # --- Robust permission check for cache directory ---
         if self._cache_dir:
             try:
@@ -105,17 +116,11 @@ class HomeAssistantCache:
         Returns:
             bool: True if the entity is relevant for caching
         """
-        domain = entity_id.split('.')[0] if '.' in entity_id else ''
-        
-        # Don't cache system entities
-        if domain in self.SYSTEM_ENTITIES:
-            return False
+        domain, sep, _ = entity_id.partition('.')
         
-        # Cache user-controllable entities, input helpers, automation entities, and status entities
-        return (domain in self.USER_CONTROLLABLE_ENTITIES or 
-                domain in self.INPUT_HELPERS or 
-                domain in self.AUTOMATION_ENTITIES or 
-                domain in self.STATUS_ENTITIES)
+        # Cache user-controllable entities, input helpers, automation entities, and
+        # status entities, but never system entities
+        return bool(sep) and domain in self._RELEVANT_ENTITY_DOMAINS
     
     def _is_relevant_service(self, domain: str) -> bool:
         """Check if a service domain is relevant for user commands.
@@ -158,6 +163,7 @@ class HomeAssistantCache:
             entry = self._cache[key]
             if time.time() > entry['expires_at']:
                 del self._cache[key]
+                self._generation += 1
             else:
                 return entry['value']
         
@@ -207,6 +213,7 @@ class HomeAssistantCache:
         
         # Store in memory cache
         self._cache[key] = entry
+        self._generation += 1
         
         # Store in persistent cache if requested and directory is available
         if persist and self._cache_dir:
@@ -232,7 +239,9 @@ class HomeAssistantCache:
             if self._is_relevant_entity(entity_id):
                 relevant_entities.append(entity)
             else:
-                domain = entity_id.split('.')[0] if '.' in entity_id else ''
+                domain, sep, _ = entity_id.partition('.')
+                if not sep:
+                    domain = ''
                 if domain in self.SYSTEM_ENTITIES:
                     system_entities.append(entity_id)
         
@@ -303,6 +312,7 @@ class HomeAssistantCache:
             key: The cache key to remove
         """
         self._cache.pop(key, None)
+        self._generation += 1
         
         # Remove from persistent cache if available
         if self._cache_dir:
@@ -313,6 +323,7 @@ class HomeAssistantCache:
     def clear(self) -> None:
         """Clear all entries from the cache."""
         self._cache.clear()
+        self._generation += 1
         
         # Clear persistent cache if available
         if self._cache_dir and self._cache_dir.exists():
@@ -348,6 +359,7 @@ class HomeAssistantCache:
         ]
         for key in expired_keys:
             del self._cache[key]
+        removed_files = 0
         
         # Clean persistent cache
         if self._cache_dir and self._cache_dir.exists():
@@ -358,13 +370,19 @@ class HomeAssistantCache:
                     
                     if time.time() > entry['expires_at']:
                         cache_file.unlink()
+                        removed_files += 1
                         logger.debug(f"Removed expired cache file: {cache_file}")
                         
                 except (json.JSONDecodeError, IOError):
                     # Remove corrupted files
                     cache_file.unlink()
+                    removed_files += 1
                     logger.warning(f"Removed corrupted cache file: {cache_file}")
         
+        # Only invalidate the version memo when the sweep changed something
+        if expired_keys or removed_files:
+            self._generation += 1
+        
         if expired_keys:
             logger.info(f"Cleaned up {len(expired_keys)} expired cache entries")
     
@@ -405,9 +423,15 @@ class HomeAssistantCache:
     def get_version(self) -> str:
         """Get a version string for the current cache state.
         
+        The result is reused until the cache is next modified, so repeated
+        calls do not rescan the persistent cache directory.
+        
         Returns:
             Version string based on cache content and modification times
         """
+        if self._version_cache is not None and self._version_cache[0] == self._generation:
+            return self._version_cache[1]
+        
         try:
             # Get cache statistics
             stats = self.get_stats()
@@ -420,7 +444,9 @@ class HomeAssistantCache:
             cache_state = f"{memory_count}-{persistent_count}-{self._ttl}-{self._max_size}"
             content_hash = hash(cache_state)
             
-            return f"{content_hash}"
+            version = f"{content_hash}"
+            self._version_cache = (self._generation, version)
+            return version
             
         except Exception as e:
             logger.warning(f"Error generating cache version: {e}")
@@ -23,8 +23,9 @@ import asyncio
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 import logging
+from orac.config import NetworkConfig
 from .config import HomeAssistantConfig
-from .constants import API_STATES, API_SERVICES, API_AREAS, API_ENTITY_REGISTRY, API_DEVICE_REGISTRY
+from .constants import API_ROOT, API_STATES, API_SERVICES, API_AREAS, API_ENTITY_REGISTRY, API_DEVICE_REGISTRY
 from .models import HomeAssistantEntity, HomeAssistantService
 from .cache import HomeAssistantCache
 
@@ -47,6 +48,11 @@ class HomeAssistantClient:
             "Content-Type": "application/json",
         }
         
+        # Caps in-flight requests so concurrent fetches don't burst the HA API.
+        # Created with the session in __aenter__, since before Python 3.10 a
+        # semaphore binds to the event loop current at construction
+        self._request_semaphore: Optional[asyncio.Semaphore] = None
+        
         # Initialize cache with persistent storage if configured
         self._cache = HomeAssistantCache(
             ttl=config.cache_ttl,
@@ -61,6 +67,7 @@ class HomeAssistantClient:
                 headers=self._headers,
                 timeout=aiohttp.ClientTimeout(total=self.config.timeout)
             )
+            self._request_semaphore = asyncio.Semaphore(NetworkConfig.HA_MAX_CONCURRENT_REQUESTS)
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -68,6 +75,7 @@ class HomeAssistantClient:
         if self._session is not None:
             await self._session.close()
             self._session = None
+            self._request_semaphore = None
 
     async def _request(self, method: str, endpoint: str, **kwargs) -> Any:
         """Make an HTTP request to the Home Assistant API.
@@ -88,9 +96,10 @@ class HomeAssistantClient:
             
         url = f"{self._base_url}{endpoint}"
         try:
-            async with self._session.request(method, url, **kwargs) as response:
-                response.raise_for_status()
-                return await response.json()
+            async with self._request_semaphore:
+                async with self._session.request(method, url, **kwargs) as response:
+                    response.raise_for_status()
+                    return await response.json()
         except aiohttp.ClientError as e:
             logger.error(f"API request failed: {e}")
             raise
@@ -259,8 +268,13 @@ class HomeAssistantClient:
             bool: True if connection is successful
         """
         try:
-            # Try to get states as a simple connection test
-            await self.get_states(use_cache=False)
+            # Ping the API root rather than pulling the full state dump,
+            # which also leaves the entity cache untouched
+            await self._request(
+                "GET",
+                API_ROOT,
+                timeout=aiohttp.ClientTimeout(total=NetworkConfig.SHORT_TIMEOUT)
+            )
             return True
         except Exception as e:
             logger.error(f"Connection validation failed: {e}")
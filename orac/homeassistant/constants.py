@@ -7,6 +7,7 @@ change during runtime.
 """
 
 # API Endpoints
+API_ROOT = "/api/"
 API_STATES = "/api/states"
 API_SERVICES = "/api/services"
 API_AREAS = "/api/config/areas"
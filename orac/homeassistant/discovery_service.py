@@ -5,6 +5,7 @@ This module provides the HADiscoveryService class that orchestrates the complete
 discovery process for Home Assistant entities, areas, devices, and their relationships.
 """
 
+import asyncio
 import logging
 from typing import Dict, List, Optional, Any
 from .client import HomeAssistantClient
@@ -40,24 +41,19 @@ class HADiscoveryService:
         logger.info("Starting complete Home Assistant discovery...")
         
         try:
-            # 1. Get all entities
-            logger.info("Fetching entities...")
-            entities = await self.client.get_states()
+            # 1-4. Fetch entities, areas, devices and the entity registry.
+            # The requests are independent, so issue them concurrently and
+            # pay for a single round trip instead of four.
+            logger.info("Fetching entities, areas, device registry and entity registry...")
+            entities, areas, devices, entity_registry = await asyncio.gather(
+                self.client.get_states(),
+                self.client.get_areas(),
+                self.client.get_device_registry(),
+                self.client.get_entity_registry()
+            )
             logger.info(f"Found {len(entities)} entities")
-            
-            # 2. Get areas (rooms)
-            logger.info("Fetching areas...")
-            areas = await self.client.get_areas()
             logger.info(f"Found {len(areas)} areas")
-            
-            # 3. Get devices and their area assignments
-            logger.info("Fetching device registry...")
-            devices = await self.client.get_device_registry()
             logger.info(f"Found {len(devices)} devices")
-            
-            # 4. Get entity registry for area assignments
-            logger.info("Fetching entity registry...")
-            entity_registry = await self.client.get_entity_registry()
             logger.info(f"Found {len(entity_registry)} entity registry entries")
             
             # 5. Build the discovery result
@@ -158,7 +154,7 @@ class HADiscoveryService:
         # Count entities by domain
         domain_counts = {}
         for entity in entities:
-            domain = entity['entity_id'].split('.')[0]
+            domain = entity['entity_id'].partition('.')[0]
             domain_counts[domain] = domain_counts.get(domain, 0) + 1
         
         # Count entities with area assignments
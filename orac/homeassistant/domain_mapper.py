@@ -6,11 +6,29 @@ for LLM grammar constraints, including smart detection for edge cases.
 """
 
 import logging
+import re
 from typing import Dict, List, Optional, Any
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+
+def _compile_indicators(*indicators: str) -> "re.Pattern[str]":
+    """Compile indicator keywords into a single substring-matching regex."""
+    return re.compile('|'.join(map(re.escape, indicators)))
+
+
+# Keyword indicators used to refine device types, compiled once at import so
+# per-entity classification is a single C-level scan per string.
+_TV_INDICATORS_RE = _compile_indicators('tv', 'television', 'display', 'monitor', 'screen')
+_MUSIC_INDICATORS_RE = _compile_indicators('speaker', 'audio', 'sound', 'music', 'amp', 'receiver')
+_LIGHT_INDICATORS_RE = _compile_indicators('light', 'lamp', 'bulb', 'ceiling', 'wall', 'floor')
+_NON_BLIND_INDICATORS_RE = _compile_indicators('garage', 'door', 'gate', 'shutter')
+_SCENE_INDICATORS_RE = _compile_indicators('scene', 'good night', 'morning', 'evening', 'mode')
+
+# Shared fallback for entities without attributes; never mutated
+_EMPTY_ATTRIBUTES: Dict[str, Any] = {}
+
 class DeviceType(str, Enum):
     """Simplified device types for user-friendly commands."""
     LIGHTS = "lights"
@@ -52,6 +70,16 @@ class DomainMapper:
         'automation': ["trigger", "run", "start"]
     }
     
+    # Domains that need smart detection rather than a direct mapping
+    SMART_DETECTION_DOMAINS = ('media_player', 'switch', 'cover', 'input_button')
+    
+    # Supported domains, built once so membership checks are a single hash lookup
+    _SUPPORTED_DOMAINS = frozenset(DOMAIN_TO_DEVICE_TYPE).union(SMART_DETECTION_DOMAINS)
+    
+    # Sorted actions per device type, filled on first request; the tables
+    # they derive from are class constants, so results never change
+    _ACTIONS_BY_DEVICE_TYPE: Dict[DeviceType, List[str]] = {}
+    
     def __init__(self):
         """Initialize the domain mapper."""
         logger.info("DomainMapper initialized")
@@ -95,23 +123,18 @@ class DomainMapper:
             DeviceType.TV or DeviceType.MUSIC
         """
         entity_id = entity['entity_id'].lower()
-        friendly_name = entity.get('attributes', {}).get('friendly_name', '').lower()
-        device_class = entity.get('attributes', {}).get('device_class', '').lower()
+        attributes = entity.get('attributes') or _EMPTY_ATTRIBUTES
+        friendly_name = attributes.get('friendly_name', '').lower()
+        device_class = attributes.get('device_class', '').lower()
         
         # TV indicators
-        tv_indicators = ['tv', 'television', 'display', 'monitor', 'screen']
-        if any(indicator in entity_id for indicator in tv_indicators):
-            return DeviceType.TV
-        if any(indicator in friendly_name for indicator in tv_indicators):
+        if _TV_INDICATORS_RE.search(entity_id) or _TV_INDICATORS_RE.search(friendly_name):
             return DeviceType.TV
         if 'tv' in device_class:
             return DeviceType.TV
         
         # Music indicators
-        music_indicators = ['speaker', 'audio', 'sound', 'music', 'amp', 'receiver']
-        if any(indicator in entity_id for indicator in music_indicators):
-            return DeviceType.MUSIC
-        if any(indicator in friendly_name for indicator in music_indicators):
+        if _MUSIC_INDICATORS_RE.search(entity_id) or _MUSIC_INDICATORS_RE.search(friendly_name):
             return DeviceType.MUSIC
         
         # Default to music for unknown media players
@@ -127,13 +150,10 @@ class DomainMapper:
             DeviceType.LIGHTS if it controls lights, None if generic switch
         """
         entity_id = entity['entity_id'].lower()
-        friendly_name = entity.get('attributes', {}).get('friendly_name', '').lower()
+        friendly_name = (entity.get('attributes') or _EMPTY_ATTRIBUTES).get('friendly_name', '').lower()
         
         # Light control indicators
-        light_indicators = ['light', 'lamp', 'bulb', 'ceiling', 'wall', 'floor']
-        if any(indicator in entity_id for indicator in light_indicators):
-            return DeviceType.LIGHTS
-        if any(indicator in friendly_name for indicator in light_indicators):
+        if _LIGHT_INDICATORS_RE.search(entity_id) or _LIGHT_INDICATORS_RE.search(friendly_name):
             return DeviceType.LIGHTS
         
         # Skip generic switches (don't include in mapping)
@@ -149,11 +169,9 @@ class DomainMapper:
             DeviceType.BLINDS or DeviceType.SWITCH for non-blind covers
         """
         entity_id = entity['entity_id'].lower()
-        friendly_name = entity.get('attributes', {}).get('friendly_name', '').lower()
         
         # Non-blind indicators
-        non_blind_indicators = ['garage', 'door', 'gate', 'shutter']
-        if any(indicator in entity_id for indicator in non_blind_indicators):
+        if _NON_BLIND_INDICATORS_RE.search(entity_id):
             return DeviceType.SWITCH  # Treat as generic switch
         
         return DeviceType.BLINDS
@@ -168,13 +186,10 @@ class DomainMapper:
             DeviceType.SCENE for scene triggers
         """
         entity_id = entity['entity_id'].lower()
-        friendly_name = entity.get('attributes', {}).get('friendly_name', '').lower()
+        friendly_name = (entity.get('attributes') or _EMPTY_ATTRIBUTES).get('friendly_name', '').lower()
         
         # Scene indicators
-        scene_indicators = ['scene', 'good night', 'morning', 'evening', 'mode']
-        if any(indicator in entity_id for indicator in scene_indicators):
-            return DeviceType.SCENE
-        if any(indicator in friendly_name for indicator in scene_indicators):
+        if _SCENE_INDICATORS_RE.search(entity_id) or _SCENE_INDICATORS_RE.search(friendly_name):
             return DeviceType.SCENE
         
         # Default to scene for input buttons
@@ -189,6 +204,10 @@ class DomainMapper:
         Returns:
             List of available actions for the device type
         """
+        cached = self._ACTIONS_BY_DEVICE_TYPE.get(device_type)
+        if cached is not None:
+            return list(cached)
+        
         actions = set()
         
         # Find which domains map to this device type
@@ -206,7 +225,8 @@ class DomainMapper:
             actions.update(self.DOMAIN_ACTIONS.get('scene', []))
             actions.update(self.DOMAIN_ACTIONS.get('input_button', []))
         
-        return sorted(list(actions))
+        self._ACTIONS_BY_DEVICE_TYPE[device_type] = sorted(actions)
+        return list(self._ACTIONS_BY_DEVICE_TYPE[device_type])
     
     def get_actions_for_domain(self, domain: str) -> List[str]:
         """Get available actions for a domain.
@@ -225,7 +245,7 @@ class DomainMapper:
         Returns:
             List of domains that are supported for mapping
         """
-        return list(self.DOMAIN_TO_DEVICE_TYPE.keys()) + ['media_player', 'switch', 'cover', 'input_button']
+        return list(self.DOMAIN_TO_DEVICE_TYPE.keys()) + list(self.SMART_DETECTION_DOMAINS)
     
     def is_supported_domain(self, domain: str) -> bool:
         """Check if a domain is supported for mapping.
@@ -236,4 +256,4 @@ class DomainMapper:
         Returns:
             True if the domain is supported, False otherwise
         """
-        return domain in self.get_supported_domains() 
\ No newline at end of file
+        return domain in self._SUPPORTED_DOMAINS
\ No newline at end of file
@@ -6,11 +6,141 @@ using multiple strategies, enabling room-based commands and location-aware
 grammar constraints.
 """
 
+import functools
 import logging
+import re
+from collections import defaultdict
 from typing import Dict, List, Optional, Any, Set
 
+from .domain_mapper import DomainMapper
+
 logger = logging.getLogger(__name__)
 
+# Common location patterns for parsing entity names and IDs, in priority order
+_COMMON_LOCATIONS = {
+    'bedroom': ['bedroom', 'master', 'guest', 'kids', 'child', 'sleep'],
+    'kitchen': ['kitchen', 'cooking', 'pantry', 'dining'],
+    'living room': ['living', 'lounge', 'family', 'sitting', 'tv room'],
+    'bathroom': ['bathroom', 'toilet', 'shower', 'washroom', 'restroom'],
+    'office': ['office', 'study', 'workspace', 'desk', 'work'],
+    'garage': ['garage', 'carport', 'parking'],
+    'basement': ['basement', 'cellar', 'lower'],
+    'attic': ['attic', 'loft', 'upper'],
+    'hallway': ['hall', 'corridor', 'passage', 'entry'],
+    'dining room': ['dining', 'dinner', 'eat'],
+    'laundry': ['laundry', 'utility', 'washer', 'mudroom'],
+    'outdoor': ['outdoor', 'outside', 'exterior', 'garden', 'patio', 'yard']
+}
+
+# One compiled alternation per location, checked in priority order so
+# each location costs a single C-level scan instead of a loop of `in`s
+_LOCATION_PATTERNS = tuple(
+    (location, re.compile('|'.join(re.escape(pattern) for pattern in patterns)))
+    for location, patterns in _COMMON_LOCATIONS.items()
+)
+
+# Union of every pattern; most strings carry no location at all, so
+# one scan rejects them before the per-location priority checks
+_ANY_LOCATION_RE = re.compile('|'.join(
+    re.escape(pattern)
+    for patterns in _COMMON_LOCATIONS.values()
+    for pattern in patterns
+))
+
+# Common area-name variations mapped to standard location names
+_LOCATION_MAPPING = {
+    'living': 'living room',
+    'lounge': 'living room',
+    'family room': 'living room',
+    'sitting room': 'living room',
+    'tv room': 'living room',
+    'dining': 'dining room',
+    'dinner room': 'dining room',
+    'master bedroom': 'bedroom',
+    'guest bedroom': 'bedroom',
+    'kids bedroom': 'bedroom',
+    'child bedroom': 'bedroom',
+    'utility room': 'laundry',
+    'washer room': 'laundry',
+    'mudroom': 'laundry',
+    'garden': 'outdoor',
+    'patio': 'outdoor',
+    'backyard': 'outdoor',
+    'front yard': 'outdoor',
+    'entry': 'hallway',
+    'entryway': 'hallway'
+}
+
+# Placeholder locations that never form a room in the mapping
+_NON_ROOM_LOCATIONS = frozenset({'unknown', 'all', 'everywhere'})
+
+# Turns underscores and hyphens into spaces in a single pass
+_SEPARATOR_TRANSLATION = str.maketrans('_-', '  ')
+
+
+@functools.lru_cache(maxsize=1024)
+def _normalize_area_name(area_name: str) -> str:
+    """Normalize area name to standard location format.
+    
+    Area names repeat across every entity in a room, so results are cached.
+    
+    Args:
+        area_name: Raw area name from Home Assistant
+        
+    Returns:
+        Normalized location name
+    """
+    # Convert to lowercase and replace underscores/hyphens with spaces
+    normalized = area_name.lower().translate(_SEPARATOR_TRANSLATION)
+    
+    # Map common variations to standard names
+    return _LOCATION_MAPPING.get(normalized, normalized)
+
+
+@functools.lru_cache(maxsize=1024)
+def _match_location(text: str) -> Optional[str]:
+    """Find the first location whose patterns occur in the text.
+    
+    Names and ID prefixes recur across entities and detection passes, so
+    results are cached.
+    
+    Args:
+        text: Lowercased entity ID, friendly name or device name
+        
+    Returns:
+        Location name or None
+    """
+    if not _ANY_LOCATION_RE.search(text):
+        return None
+    
+    for location, pattern_re in _LOCATION_PATTERNS:
+        if pattern_re.search(text):
+            return location
+    
+    return None
+
+
+def _index_entity_registry(entity_registry: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Index entity registry entries by entity ID.
+    
+    Args:
+        entity_registry: List of entity registry entries
+        
+    Returns:
+        Mapping of entity_id -> registry entry. The first entry wins, except
+        that its device_id comes from the first entry that has one
+    """
+    registry_by_id = {}
+    for reg_entity in entity_registry:
+        entity_id = reg_entity['entity_id']
+        indexed = registry_by_id.get(entity_id)
+        if indexed is None:
+            registry_by_id[entity_id] = reg_entity
+        elif not indexed.get('device_id') and reg_entity.get('device_id'):
+            registry_by_id[entity_id] = {**indexed, 'device_id': reg_entity['device_id']}
+    return registry_by_id
+
+
 class LocationDetector:
     """Detects entity locations using multiple strategies.
     
@@ -29,21 +159,12 @@ class LocationDetector:
     
     def __init__(self):
         """Initialize the location detector with common location patterns."""
-        # Common location patterns for parsing entity names and IDs
-        self.common_locations = {
-            'bedroom': ['bedroom', 'master', 'guest', 'kids', 'child', 'sleep'],
-            'kitchen': ['kitchen', 'cooking', 'pantry', 'dining'],
-            'living room': ['living', 'lounge', 'family', 'sitting', 'tv room'],
-            'bathroom': ['bathroom', 'toilet', 'shower', 'washroom', 'restroom'],
-            'office': ['office', 'study', 'workspace', 'desk', 'work'],
-            'garage': ['garage', 'carport', 'parking'],
-            'basement': ['basement', 'cellar', 'lower'],
-            'attic': ['attic', 'loft', 'upper'],
-            'hallway': ['hall', 'corridor', 'passage', 'entry'],
-            'dining room': ['dining', 'dinner', 'eat'],
-            'laundry': ['laundry', 'utility', 'washer', 'mudroom'],
-            'outdoor': ['outdoor', 'outside', 'exterior', 'garden', 'patio', 'yard']
-        }
+        # Patterns and compiled matchers are shared module constants
+        self.common_locations = _COMMON_LOCATIONS
+        
+        # Domain classification reused by every build_location_mapping call
+        self._domain_mapper = DomainMapper()
+        self._supported_domains = frozenset(self._domain_mapper.get_supported_domains())
         
         logger.info("LocationDetector initialized")
     
@@ -52,7 +173,8 @@ class LocationDetector:
                        entity_area_map: Dict[str, str],
                        device_area_map: Dict[str, str],
                        areas: Dict[str, str],
-                       entity_registry: List[Dict[str, Any]]) -> Optional[str]:
+                       entity_registry: List[Dict[str, Any]],
+                       entity_registry_by_id: Optional[Dict[str, Dict[str, Any]]] = None) -> Optional[str]:
         """Detect entity location using multiple strategies.
         
         Args:
@@ -61,6 +183,9 @@ class LocationDetector:
             device_area_map: Mapping of device_id -> area_id from device registry
             areas: Mapping of area_id -> area_name from area registry
             entity_registry: List of entity registry entries
+            entity_registry_by_id: Optional prebuilt entity_id -> registry entry
+                index; pass it when detecting many entities to avoid rescanning
+                entity_registry for each one
             
         Returns:
             Normalized location name (e.g., "bedroom", "kitchen") or None if not found
@@ -68,142 +193,46 @@ class LocationDetector:
         entity_id = entity['entity_id']
         
         # Strategy 1: Direct entity area assignment (most accurate)
-        location = self._check_entity_area_assignment(entity_id, entity_area_map, areas)
+        area_id = entity_area_map.get(entity_id)
+        location = _normalize_area_name(areas[area_id]) if area_id in areas else None
         if location:
-            logger.debug(f"Location detected via entity area assignment: {entity_id} -> {location}")
+            logger.debug("Location detected via entity area assignment: %s -> %s", entity_id, location)
             return location
         
+        # Registry entry shared by the device-based strategies
+        if entity_registry_by_id is None:
+            entity_registry_by_id = _index_entity_registry(entity_registry)
+        registry_entry = entity_registry_by_id.get(entity_id) or {}
+        
         # Strategy 2: Device area assignment (very accurate)
-        location = self._check_device_area_assignment(entity_id, device_area_map, areas, entity_registry)
+        device_id = registry_entry.get('device_id')
+        area_id = device_area_map.get(device_id) if device_id else None
+        location = _normalize_area_name(areas[area_id]) if area_id in areas else None
         if location:
-            logger.debug(f"Location detected via device area assignment: {entity_id} -> {location}")
+            logger.debug("Location detected via device area assignment: %s -> %s", entity_id, location)
             return location
         
         # Strategy 3: Parse from entity ID (fallback)
-        location = self._parse_from_entity_id(entity_id)
+        location = _match_location(entity_id.lower())
         if location:
-            logger.debug(f"Location detected via entity ID parsing: {entity_id} -> {location}")
+            logger.debug("Location detected via entity ID parsing: %s -> %s", entity_id, location)
             return location
         
         # Strategy 4: Parse from friendly name (fallback)
-        location = self._parse_from_friendly_name(entity)
+        friendly_name = entity.get('attributes', {}).get('friendly_name', '')
+        location = _match_location(friendly_name.lower()) if friendly_name else None
         if location:
-            logger.debug(f"Location detected via friendly name parsing: {entity_id} -> {location}")
+            logger.debug("Location detected via friendly name parsing: %s -> %s", entity_id, location)
             return location
         
         # Strategy 5: Parse from device info (last resort)
-        location = self._parse_from_device_info(entity, entity_registry)
+        device_name = registry_entry.get('name')
+        location = _match_location(device_name.lower()) if device_name else None
         if location:
-            logger.debug(f"Location detected via device info parsing: {entity_id} -> {location}")
+            logger.debug("Location detected via device info parsing: %s -> %s", entity_id, location)
             return location
         
-        logger.debug(f"No location detected for entity: {entity_id}")
-        return None
-    
-    def _check_entity_area_assignment(self, entity_id: str, entity_area_map: Dict[str, str], areas: Dict[str, str]) -> Optional[str]:
-        """Check if entity has direct area assignment.
-        
-        Args:
-            entity_id: The entity ID to check
-            entity_area_map: Mapping of entity_id -> area_id
-            areas: Mapping of area_id -> area_name
-            
-        Returns:
-            Normalized location name or None
-        """
-        if entity_id in entity_area_map:
-            area_id = entity_area_map[entity_id]
-            if area_id in areas:
-                return self._normalize_location_name(areas[area_id])
-        return None
-    
-    def _check_device_area_assignment(self, entity_id: str, device_area_map: Dict[str, str], areas: Dict[str, str], entity_registry: List[Dict[str, Any]]) -> Optional[str]:
-        """Check if entity's device has area assignment.
-        
-        Args:
-            entity_id: The entity ID to check
-            device_area_map: Mapping of device_id -> area_id
-            areas: Mapping of area_id -> area_name
-            entity_registry: List of entity registry entries
-            
-        Returns:
-            Normalized location name or None
-        """
-        # Find device ID for this entity
-        device_id = None
-        for reg_entity in entity_registry:
-            if reg_entity['entity_id'] == entity_id and reg_entity.get('device_id'):
-                device_id = reg_entity['device_id']
-                break
-        
-        if device_id and device_id in device_area_map:
-            area_id = device_area_map[device_id]
-            if area_id in areas:
-                return self._normalize_location_name(areas[area_id])
-        
-        return None
-    
-    def _parse_from_entity_id(self, entity_id: str) -> Optional[str]:
-        """Parse location from entity ID.
-        
-        Args:
-            entity_id: The entity ID to parse
-            
-        Returns:
-            Location name or None
-        """
-        entity_id_lower = entity_id.lower()
-        
-        for location, patterns in self.common_locations.items():
-            for pattern in patterns:
-                if pattern in entity_id_lower:
-                    return location
-        
-        return None
-    
-    def _parse_from_friendly_name(self, entity: Dict[str, Any]) -> Optional[str]:
-        """Parse location from friendly name.
-        
-        Args:
-            entity: Home Assistant entity data
-            
-        Returns:
-            Location name or None
-        """
-        friendly_name = entity.get('attributes', {}).get('friendly_name', '').lower()
-        if not friendly_name:
-            return None
-        
-        for location, patterns in self.common_locations.items():
-            for pattern in patterns:
-                if pattern in friendly_name:
-                    return location
-        
-        return None
-    
-    def _parse_from_device_info(self, entity: Dict[str, Any], entity_registry: List[Dict[str, Any]]) -> Optional[str]:
-        """Parse location from device information.
-        
-        Args:
-            entity: Home Assistant entity data
-            entity_registry: List of entity registry entries
-            
-        Returns:
-            Location name or None
-        """
-        entity_id = entity['entity_id']
-        
-        # Find device info for this entity
-        for reg_entity in entity_registry:
-            if reg_entity['entity_id'] == entity_id:
-                device_name = reg_entity.get('name', '').lower()
-                if device_name:
-                    for location, patterns in self.common_locations.items():
-                        for pattern in patterns:
-                            if pattern in device_name:
-                                return location
-                break
-        
+        logger.debug("No location detected for entity: %s", entity_id)
         return None
     
     def _normalize_location_name(self, area_name: str) -> str:
@@ -215,34 +244,7 @@ class LocationDetector:
         Returns:
             Normalized location name
         """
-        # Convert to lowercase and replace underscores/hyphens with spaces
-        normalized = area_name.lower().replace('_', ' ').replace('-', ' ')
-        
-        # Map common variations to standard names
-        location_mapping = {
-            'living': 'living room',
-            'lounge': 'living room',
-            'family room': 'living room',
-            'sitting room': 'living room',
-            'tv room': 'living room',
-            'dining': 'dining room',
-            'dinner room': 'dining room',
-            'master bedroom': 'bedroom',
-            'guest bedroom': 'bedroom',
-            'kids bedroom': 'bedroom',
-            'child bedroom': 'bedroom',
-            'utility room': 'laundry',
-            'washer room': 'laundry',
-            'mudroom': 'laundry',
-            'garden': 'outdoor',
-            'patio': 'outdoor',
-            'backyard': 'outdoor',
-            'front yard': 'outdoor',
-            'entry': 'hallway',
-            'entryway': 'hallway'
-        }
-        
-        return location_mapping.get(normalized, normalized)
+        return _normalize_area_name(area_name)
     
 
     
@@ -270,36 +272,36 @@ class LocationDetector:
         Returns:
             Hierarchical mapping of location -> device_type -> entity_ids
         """
-        from .domain_mapper import DomainMapper
+        # Bound once so the per-entity loop does no attribute lookups
+        determine_device_type = self._domain_mapper.determine_device_type
+        detect_location = self.detect_location
+        supported_domains = self._supported_domains
+        location_mapping = defaultdict(lambda: defaultdict(list))
         
-        domain_mapper = DomainMapper()
-        location_mapping = {}
+        # Index the registry once for the whole batch
+        if 'entity_registry_by_id' not in kwargs and 'entity_registry' in kwargs:
+            kwargs['entity_registry_by_id'] = _index_entity_registry(kwargs['entity_registry'])
         
         for entity in entities:
             entity_id = entity['entity_id']
-            domain = entity_id.split('.')[0]
+            domain = entity_id.partition('.')[0]
             
             # Skip unsupported domains
-            if not domain_mapper.is_supported_domain(domain):
+            if domain not in supported_domains:
                 continue
             
             # Determine device type
-            device_type = domain_mapper.determine_device_type(entity, domain)
+            device_type = determine_device_type(entity, domain)
             if not device_type:
                 continue
             
             # Detect location
-            location = self.detect_location(entity, **kwargs)
-            if not location or location in ['unknown', 'all', 'everywhere']:
+            location = detect_location(entity, **kwargs)
+            if not location or location in _NON_ROOM_LOCATIONS:
                 continue
             
             # Build mapping structure
-            if location not in location_mapping:
-                location_mapping[location] = {}
-            
-            if device_type.value not in location_mapping[location]:
-                location_mapping[location][device_type.value] = []
-            
             location_mapping[location][device_type.value].append(entity_id)
         
-        return location_mapping 
\ No newline at end of file
+        # Hand back plain dicts so callers don't get auto-vivifying lookups
+        return {location: dict(device_types) for location, device_types in location_mapping.items()} 
\ No newline at end of file
@@ -12,8 +12,10 @@ with automatic server management and transparent HTTP API usage.
 """
 
 import os
+import re
 import json
 import asyncio
+import functools
 import subprocess
 import aiohttp
 import weakref
@@ -23,7 +25,6 @@ import yaml
 from typing import List, Dict, Any, Optional, Set
 from pathlib import Path
 from dataclasses import dataclass
-from contextlib import asynccontextmanager
 
 from orac.logger import get_logger
 from orac.models import PromptResponse
@@ -42,6 +43,14 @@ null ::= "null"
 ws ::= [ \t\n\r]*
 '''
 
+# Chat-template markers llama-server may emit in free-form output; used as
+# stop sequences and stripped from the response in a single regex pass
+_RESPONSE_MARKERS = ("<|im_end|>", "<|im_start|>", "<think>", "</think>")
+_RESPONSE_MARKER_RE = re.compile("|".join(map(re.escape, _RESPONSE_MARKERS)))
+
+# Outermost {...} span, used to salvage JSON wrapped in other text
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
 # Get logger for this module
 logger = get_logger(__name__)
 
@@ -57,11 +66,42 @@ DEFAULT_HOST = "127.0.0.1"
 DEFAULT_PORT = 8080
 DEFAULT_TIMEOUT = 30
 
+# llama-server startup: how long to wait for the model to load, and the
+# backoff bounds between /health probes while waiting
+SERVER_START_TIMEOUT = 15.0
+SERVER_POLL_MIN_DELAY = 0.05
+SERVER_POLL_MAX_DELAY = 0.5
+
+# Connection pool for llama-server traffic: total connections across all
+# servers, and per server so one busy model cannot starve health probes
+# and requests to the others
+HTTP_POOL_LIMIT = 100
+HTTP_POOL_LIMIT_PER_HOST = 32
+
 # Orin Nano optimizations (configurable via environment)
 ORIN_NANO_OPTIMIZATIONS = os.getenv("ORAC_ORIN_OPTIMIZATIONS", "true").lower() == "true"
 ORIN_CTX_SIZE = os.getenv("ORAC_CTX_SIZE", "2048")
 ORIN_GPU_LAYERS = os.getenv("ORAC_GPU_LAYERS", "999")
 
+# Strong references to fire-and-forget tasks; the event loop only keeps
+# weak references, so an unreferenced task can be collected mid-flight
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def _spawn_background_task(coro) -> asyncio.Task:
+    """Schedule a coroutine and keep it alive until it finishes.
+
+    Args:
+        coro: Coroutine to run on the current event loop
+
+    Returns:
+        The created task
+    """
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
 @dataclass
 class ServerState:
     """Internal state for a running server instance."""
@@ -69,7 +109,6 @@ class ServerState:
     host: str
     port: int
     model: str
-    session: Optional[aiohttp.ClientSession] = None
     last_used: float = 0.0
     grammar_file: Optional[str] = None  # Track grammar to avoid unnecessary restarts
     pre_warmed: bool = False  # Whether KV cache has been pre-warmed with system prompt
@@ -77,14 +116,52 @@ class ServerState:
     last_health_check: Optional[float] = None  # Timestamp of last health check
     restart_count: int = 0  # Number of times server was restarted
 
+
+def _terminate_servers(servers: Dict[str, ServerState], ports: Set[int], timeout: float = 1) -> int:
+    """Synchronously terminate llama-server subprocesses and forget them.
+
+    Also runs from a client's weakref finalizer (on garbage collection or at
+    interpreter exit), so it must not touch the event loop.
+
+    Args:
+        servers: Model -> server state map; stopped entries are removed
+        ports: Port registry to release the servers' ports from
+        timeout: Seconds to wait for each process before killing it
+
+    Returns:
+        Number of servers stopped
+    """
+    stopped = 0
+    for model in list(servers.keys()):
+        try:
+            server = servers[model]
+            if server.process and server.process.poll() is None:
+                server.process.terminate()
+                try:
+                    server.process.wait(timeout=timeout)
+                except subprocess.TimeoutExpired:
+                    server.process.kill()
+            ports.discard(server.port)
+            del servers[model]
+            stopped += 1
+        except Exception as e:
+            logger.error(f"Error stopping server for model {model}: {e}")
+    return stopped
+
 class LlamaCppClient:
     """Client for interacting with llama.cpp binaries."""
     
     # Class-level tracking of all client instances and their servers
     _instances: Set[weakref.ReferenceType['LlamaCppClient']] = set()
     _server_ports: Set[int] = set()
+    # Single health/cleanup task shared by all live instances, and the event
+    # that wakes it for shutdown
+    _cleanup_task: Optional[asyncio.Task] = None
+    _cleanup_shutdown: Optional[asyncio.Event] = None
     # Class-level cache for grammars
     _grammars: Optional[Dict[str, Dict[str, Any]]] = None
+    # Class-level cache for the whitespace-stripped JSON grammar
+    _json_grammar: Optional[str] = None
     # Class-level cache for model configurations
     _model_configs: Optional[Dict[str, Any]] = None
     # Class-level cache for system prompts
@@ -114,7 +191,6 @@ class LlamaCppClient:
         # Internal state
         self._servers: Dict[str, ServerState] = {}  # model -> server state
         self._session: Optional[aiohttp.ClientSession] = None
-        self._cleanup_task: Optional[asyncio.Task] = None
         self._shutdown_event = asyncio.Event()
 
         # Health monitoring settings
@@ -140,83 +216,16 @@ class LlamaCppClient:
         
         # Register this instance for cleanup
         self._instances.add(weakref.ref(self, self._cleanup_instance))
+
+        # Terminate any servers still running when this client is collected or
+        # the interpreter exits; aclose() is the orderly path
+        self._finalizer = weakref.finalize(self, _terminate_servers, self._servers, self._server_ports)
         
-        # Start cleanup task if not already running
-        if not any(hasattr(inst(), '_cleanup_task') and inst()._cleanup_task for inst in self._instances if inst()):
-            self._cleanup_task = asyncio.create_task(self._periodic_cleanup())
+        # Start the shared cleanup task if not already running
+        self._ensure_cleanup_task()
         
         logger.info("LlamaCppClient initialized successfully")
 
-    def __del__(self):
-        """Clean up resources when the client is destroyed."""
-        try:
-            # Signal the cleanup task to stop
-            if hasattr(self, '_shutdown_event'):
-                self._shutdown_event.set()
-            
-            # Only try to clean up servers if _servers was initialized
-            if not hasattr(self, '_servers'):
-                return
-                
-            # Stop all servers
-            for model in list(self._servers.keys()):
-                try:
-                    server = self._servers[model]
-                    if server.process and server.process.poll() is None:
-                        server.process.terminate()
-                        try:
-                            server.process.wait(timeout=1)
-                        except subprocess.TimeoutExpired:
-                            server.process.kill()
-                    
-                    # Close session in a new event loop if needed
-                    if server.session and not server.session.closed:
-                        try:
-                            loop = asyncio.get_event_loop()
-                            if loop.is_running():
-                                asyncio.create_task(server.session.close())
-                            else:
-                                loop = asyncio.new_event_loop()
-                                asyncio.set_event_loop(loop)
-                                loop.run_until_complete(server.session.close())
-                                loop.close()
-                        except Exception as e:
-                            logger.error(f"Error closing server session: {str(e)}")
-                    
-                    if self._session and not self._session.closed:
-                        try:
-                            loop = asyncio.get_event_loop()
-                            if loop.is_running():
-                                asyncio.create_task(self._session.close())
-                            else:
-                                loop = asyncio.new_event_loop()
-                                asyncio.set_event_loop(loop)
-                                loop.run_until_complete(self._session.close())
-                                loop.close()
-                        except Exception as e:
-                            logger.error(f"Error closing main session: {str(e)}")
-                    
-                    self._server_ports.discard(server.port)
-                    del self._servers[model]
-                except Exception as e:
-                    logger.error(f"Error cleaning up server for model {model}: {str(e)}")
-            
-            # Cancel the cleanup task
-            if hasattr(self, '_cleanup_task') and self._cleanup_task and not self._cleanup_task.done():
-                try:
-                    loop = asyncio.get_event_loop()
-                    if loop.is_running():
-                        self._cleanup_task.cancel()
-                    else:
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-                        loop.run_until_complete(self._cleanup_task.cancel())
-                        loop.close()
-                except Exception as e:
-                    logger.error(f"Error cancelling cleanup task: {str(e)}")
-        except Exception as e:
-            logger.error(f"Error in __del__: {str(e)}")
-
     @classmethod
     def _cleanup_instance(cls, ref):
         """Clean up when a client instance is destroyed."""
@@ -236,19 +245,19 @@ class LlamaCppClient:
             True if server is healthy, False otherwise
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"http://{server.host}:{server.port}/health",
-                    timeout=aiohttp.ClientTimeout(total=self._health_check_timeout)
-                ) as response:
-                    if response.status == 200:
-                        health_data = await response.json()
-                        status = health_data.get("status", "")
-                        if status == "ok":
-                            return True
-                        elif "loading" in status.lower():
-                            # Model loading, consider healthy
-                            return True
+            session = self._ensure_session()
+            async with session.get(
+                f"http://{server.host}:{server.port}/health",
+                timeout=aiohttp.ClientTimeout(total=self._health_check_timeout)
+            ) as response:
+                if response.status == 200:
+                    health_data = await response.json()
+                    status = health_data.get("status", "")
+                    if status == "ok":
+                        return True
+                    elif "loading" in status.lower():
+                        # Model loading, consider healthy
+                        return True
             return False
         except asyncio.TimeoutError:
             logger.warning(f"Health check timed out for model {model} on port {server.port}")
@@ -257,75 +266,145 @@ class LlamaCppClient:
             logger.warning(f"Health check failed for model {model}: {e}")
             return False
 
-    async def _periodic_cleanup(self):
-        """Periodically clean up unused servers and check health."""
-        try:
-            while not self._shutdown_event.is_set():
-                current_time = asyncio.get_event_loop().time()
-                for model, server in list(self._servers.items()):
-                    # Check if server process is still running
-                    if server.process.poll() is not None:
-                        exit_code = server.process.poll()
-                        logger.warning(f"Server for model {model} died (exit code: {exit_code})")
-                        await self._stop_server(model)
-                        continue
+    @classmethod
+    def _ensure_cleanup_task(cls) -> None:
+        """Start the shared periodic cleanup task unless it is already running.
 
-                    # Perform health check
-                    server.last_health_check = current_time
-                    healthy = await self._check_server_health(model, server)
+        A task still pending on another event loop (for example one that has
+        since been closed) is abandoned and replaced on the running loop.
+        """
+        task = cls._cleanup_task
+        if task is not None and not task.done():
+            if task.get_loop() is asyncio.get_running_loop():
+                return
+            _background_tasks.discard(task)
+        cls._cleanup_shutdown = asyncio.Event()
+        cls._cleanup_task = _spawn_background_task(cls._periodic_cleanup(cls._cleanup_shutdown))
 
-                    if not healthy:
-                        server.consecutive_failures += 1
-                        logger.warning(
-                            f"llama-server health check failed for {model} "
-                            f"({server.consecutive_failures}/{self._max_consecutive_failures})"
-                        )
+    @classmethod
+    def _stop_cleanup_task(cls) -> None:
+        """Stop the shared cleanup task once no open client is left.
 
-                        if server.consecutive_failures >= self._max_consecutive_failures:
-                            logger.error(
-                                f"llama-server for {model} unresponsive for "
-                                f"{server.consecutive_failures} checks, restarting..."
-                            )
-                            # Store grammar file for restart
-                            grammar_file = server.grammar_file
-                            await self._stop_server(model)
+        Must be called from a running event loop.
+        """
+        for ref in list(cls._instances):
+            client = ref()
+            if client is not None and not client._shutdown_event.is_set():
+                return
 
-                            # Restart the server
-                            try:
-                                new_server = await self._start_internal_server(
-                                    model=model,
-                                    host=DEFAULT_HOST,
-                                    port=self._find_available_port(),
-                                    grammar_file=grammar_file
-                                )
-                                new_server.restart_count = server.restart_count + 1
-                                self._servers[model] = new_server
-                                self._server_ports.add(new_server.port)
-                                self._total_restart_count += 1
-                                logger.info(
-                                    f"llama-server for {model} restarted successfully "
-                                    f"(restart #{new_server.restart_count})"
-                                )
-                            except Exception as e:
-                                logger.error(f"Failed to restart llama-server for {model}: {e}")
-                    else:
-                        if server.consecutive_failures > 0:
-                            logger.info(f"llama-server for {model} recovered")
-                        server.consecutive_failures = 0
-
-                await asyncio.sleep(60)  # Check every minute
+        task, shutdown = cls._cleanup_task, cls._cleanup_shutdown
+        cls._cleanup_task = cls._cleanup_shutdown = None
+        if task is None or task.done():
+            return
+
+        loop = task.get_loop()
+        if loop.is_closed():
+            # Can never run again; just drop the reference
+            _background_tasks.discard(task)
+            return
+        for callback in (shutdown.set, task.cancel):
+            if loop is asyncio.get_running_loop():
+                callback()
+            else:
+                loop.call_soon_threadsafe(callback)
+
+    @classmethod
+    async def _periodic_cleanup(cls, shutdown: asyncio.Event):
+        """Periodically check the servers of every live client.
+
+        One task serves all instances and exits once none are left or
+        shutdown is set.
+
+        Args:
+            shutdown: Event that ends the loop as soon as it is set
+        """
+        try:
+            while not shutdown.is_set():
+                clients = [inst for inst in (ref() for ref in list(cls._instances)) if inst is not None]
+                if not clients:
+                    return
+                for client in clients:
+                    if not client._shutdown_event.is_set():
+                        await client._check_servers()
+
+                # Drop strong references so released clients can be collected meanwhile
+                del clients, client
+
+                # Check every minute, but wake immediately on shutdown
+                try:
+                    await asyncio.wait_for(shutdown.wait(), timeout=60)
+                except asyncio.TimeoutError:
+                    pass
         except asyncio.CancelledError:
             # Ensure we clean up any remaining servers on cancellation
-            for model in list(self._servers.keys()):
-                try:
-                    await self._stop_server(model)
-                except Exception as e:
-                    logger.error(f"Error cleaning up server during shutdown: {str(e)}")
+            for ref in list(cls._instances):
+                client = ref()
+                if client is None:
+                    continue
+                for model in list(client._servers.keys()):
+                    try:
+                        await client._stop_server(model)
+                    except Exception as e:
+                        logger.error(f"Error cleaning up server during shutdown: {str(e)}")
             raise
         except Exception as e:
             logger.error(f"Error in periodic cleanup: {str(e)}")
             raise
 
+    async def _check_servers(self):
+        """Clean up dead servers and restart unresponsive ones."""
+        current_time = asyncio.get_event_loop().time()
+        for model, server in list(self._servers.items()):
+            # Check if server process is still running
+            if server.process.poll() is not None:
+                exit_code = server.process.poll()
+                logger.warning(f"Server for model {model} died (exit code: {exit_code})")
+                await self._stop_server(model)
+                continue
+
+            # Perform health check
+            server.last_health_check = current_time
+            healthy = await self._check_server_health(model, server)
+
+            if not healthy:
+                server.consecutive_failures += 1
+                logger.warning(
+                    f"llama-server health check failed for {model} "
+                    f"({server.consecutive_failures}/{self._max_consecutive_failures})"
+                )
+
+                if server.consecutive_failures >= self._max_consecutive_failures:
+                    logger.error(
+                        f"llama-server for {model} unresponsive for "
+                        f"{server.consecutive_failures} checks, restarting..."
+                    )
+                    # Store grammar file for restart
+                    grammar_file = server.grammar_file
+                    await self._stop_server(model)
+
+                    # Restart the server
+                    try:
+                        new_server = await self._start_internal_server(
+                            model=model,
+                            host=DEFAULT_HOST,
+                            port=self._find_available_port(),
+                            grammar_file=grammar_file
+                        )
+                        new_server.restart_count = server.restart_count + 1
+                        self._servers[model] = new_server
+                        self._server_ports.add(new_server.port)
+                        self._total_restart_count += 1
+                        logger.info(
+                            f"llama-server for {model} restarted successfully "
+                            f"(restart #{new_server.restart_count})"
+                        )
+                    except Exception as e:
+                        logger.error(f"Failed to restart llama-server for {model}: {e}")
+            else:
+                if server.consecutive_failures > 0:
+                    logger.info(f"llama-server for {model} recovered")
+                server.consecutive_failures = 0
+
     def get_health_status(self) -> Dict[str, Any]:
         """Get health status of all managed servers.
 
@@ -373,13 +452,13 @@ class LlamaCppClient:
                 if server.process and server.process.poll() is None:
                     server.process.terminate()
                     try:
-                        server.process.wait(timeout=1)
+                        # Wait for the exit in a worker thread so other requests keep running
+                        await asyncio.get_running_loop().run_in_executor(
+                            None, functools.partial(server.process.wait, timeout=1)
+                        )
                     except subprocess.TimeoutExpired:
                         server.process.kill()
                 
-                if server.session and not server.session.closed:
-                    await server.session.close()
-                
                 self._server_ports.discard(server.port)
                 del self._servers[model]
             except Exception as e:
@@ -393,25 +472,30 @@ class LlamaCppClient:
         The next generation request will lazy-spawn a fresh server.
         Returns the number of servers stopped.
         """
-        stopped = 0
-        for model in list(self._servers.keys()):
-            try:
-                server = self._servers[model]
-                if server.process and server.process.poll() is None:
-                    server.process.terminate()
-                    try:
-                        server.process.wait(timeout=2)
-                    except subprocess.TimeoutExpired:
-                        server.process.kill()
-                self._server_ports.discard(server.port)
-                del self._servers[model]
-                stopped += 1
-            except Exception as e:
-                logger.error(f"Error stopping server for model {model}: {e}")
+        stopped = _terminate_servers(self._servers, self._server_ports, timeout=2)
         if stopped:
             logger.info(f"Stopped {stopped} llama-server subprocess(es); reason: {reason or 'unspecified'}")
         return stopped
 
+    async def aclose(self) -> None:
+        """Stop this client's servers and close its HTTP session.
+
+        Call on application shutdown. The garbage-collection finalizer only
+        terminates server processes; it cannot close the aiohttp session.
+        """
+        self._shutdown_event.set()
+        for model in list(self._servers.keys()):
+            try:
+                await self._stop_server(model)
+            except Exception as e:
+                logger.error(f"Error stopping server for model {model} during close: {e}")
+
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+        self._stop_cleanup_task()
+
     async def list_models(self) -> List[Dict[str, Any]]:
         """
         List available GGUF models in the models directory.
@@ -422,15 +506,17 @@ class LlamaCppClient:
         models = []
         
         if os.path.exists(self.model_path):
-            for file in os.listdir(self.model_path):
-                if file.endswith(".gguf"):
-                    model_path = os.path.join(self.model_path, file)
-                    models.append({
-                        "name": file,
-                        "size": os.path.getsize(model_path),
-                        "modified": os.path.getmtime(model_path),
-                        "backend": "llama_cpp"
-                    })
+            with os.scandir(self.model_path) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".gguf"):
+                        # One stat() per model instead of getsize + getmtime
+                        st = entry.stat()
+                        models.append({
+                            "name": entry.name,
+                            "size": st.st_size,
+                            "modified": st.st_mtime,
+                            "backend": "llama_cpp"
+                        })
         
         logger.info(f"Found {len(models)} models")
         return models
@@ -561,7 +647,7 @@ class LlamaCppClient:
             cmd.extend(["--grammar-file", grammar_file])
         elif json_mode:
             # Fallback to JSON grammar for backward compatibility
-            cmd.extend(["--grammar", self.get_grammar('json').strip()])
+            cmd.extend(["--grammar", self._get_json_grammar()])
         
         # Start the server process
         process = subprocess.Popen(
@@ -573,40 +659,42 @@ class LlamaCppClient:
         
         # Wait for server to start AND model to load
         # Note: /health returns 200 with {"status":"loading model"} while loading,
-        # and {"status":"ok"} when ready
-        for attempt in range(30):  # Try for 15 seconds (model loading can take a while)
+        # and {"status":"ok"} when ready. Probe quickly at first and back off, so
+        # a fast start is seen within tens of milliseconds without hammering a
+        # slow model load; stop early if the process has already exited.
+        session = self._ensure_session()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + SERVER_START_TIMEOUT
+        delay = SERVER_POLL_MIN_DELAY
+        while loop.time() < deadline and process.poll() is None:
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(f"http://{host}:{port}/health") as response:
-                        if response.status == 200:
-                            health_data = await response.json()
-                            status = health_data.get("status", "")
-                            if status == "ok":
-                                # Model is fully loaded and ready
-                                logger.info(f"Server ready for model {model} on port {port}")
-                                server_session = aiohttp.ClientSession(
-                                    base_url=f"http://{host}:{port}",
-                                    timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT)
-                                )
-                                return ServerState(
-                                    process=process,
-                                    host=host,
-                                    port=port,
-                                    model=model,
-                                    session=server_session,
-                                    last_used=asyncio.get_event_loop().time(),
-                                    grammar_file=grammar_file
-                                )
-                            elif "loading" in status.lower():
-                                # Model still loading, wait and retry
-                                logger.debug(f"Model still loading on port {port}...")
+                async with session.get(f"http://{host}:{port}/health") as response:
+                    if response.status == 200:
+                        health_data = await response.json()
+                        status = health_data.get("status", "")
+                        if status == "ok":
+                            # Model is fully loaded and ready
+                            logger.info(f"Server ready for model {model} on port {port}")
+                            return ServerState(
+                                process=process,
+                                host=host,
+                                port=port,
+                                model=model,
+                                last_used=asyncio.get_event_loop().time(),
+                                grammar_file=grammar_file
+                            )
+                        elif "loading" in status.lower():
+                            # Model still loading, wait and retry
+                            logger.debug(f"Model still loading on port {port}...")
             except Exception:
                 pass
-            await asyncio.sleep(0.5)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, SERVER_POLL_MAX_DELAY)
         
-        # If we get here, server didn't start
+        # If we get here, server didn't start. Collect its output off the event
+        # loop, since communicate() blocks until the process has exited.
         process.terminate()
-        stdout, stderr = process.communicate()
+        stdout, stderr = await asyncio.get_running_loop().run_in_executor(None, process.communicate)
         error = stderr.decode('utf-8', errors='replace')
         raise Exception(f"Failed to start llama server: {error}")
 
@@ -654,39 +742,39 @@ class LlamaCppClient:
             max_retries = 10
             retry_delay = 0.5  # seconds
 
-            async with aiohttp.ClientSession() as session:
-                for attempt in range(max_retries):
-                    try:
-                        async with session.post(
-                            f"http://{server.host}:{server.port}/completion",
-                            json=warmup_data,
-                            timeout=aiohttp.ClientTimeout(total=30)
-                        ) as response:
-                            if response.status == 200:
-                                elapsed = asyncio.get_event_loop().time() - start_time
-                                server.pre_warmed = True
-                                logger.info(f"KV cache pre-warmed for {server.model} in {elapsed:.3f}s")
-                                return True
-                            elif response.status == 503:
-                                # Model still loading, wait and retry
-                                error_text = await response.text()
-                                if "Loading model" in error_text and attempt < max_retries - 1:
-                                    logger.debug(f"Model still loading, retrying in {retry_delay}s...")
-                                    await asyncio.sleep(retry_delay)
-                                    continue
-                                else:
-                                    logger.warning(f"Pre-warm request failed after retries: {error_text}")
-                                    return False
+            session = self._ensure_session()
+            for attempt in range(max_retries):
+                try:
+                    async with session.post(
+                        f"http://{server.host}:{server.port}/completion",
+                        json=warmup_data,
+                        timeout=aiohttp.ClientTimeout(total=30)
+                    ) as response:
+                        if response.status == 200:
+                            elapsed = asyncio.get_event_loop().time() - start_time
+                            server.pre_warmed = True
+                            logger.info(f"KV cache pre-warmed for {server.model} in {elapsed:.3f}s")
+                            return True
+                        elif response.status == 503:
+                            # Model still loading, wait and retry
+                            error_text = await response.text()
+                            if "Loading model" in error_text and attempt < max_retries - 1:
+                                logger.debug(f"Model still loading, retrying in {retry_delay}s...")
+                                await asyncio.sleep(retry_delay)
+                                continue
                             else:
-                                error = await response.text()
-                                logger.warning(f"Pre-warm request failed: {error}")
+                                logger.warning(f"Pre-warm request failed after retries: {error_text}")
                                 return False
-                    except asyncio.TimeoutError:
-                        if attempt < max_retries - 1:
-                            logger.debug(f"Pre-warm timeout, retrying...")
-                            await asyncio.sleep(retry_delay)
-                            continue
-                        raise
+                        else:
+                            error = await response.text()
+                            logger.warning(f"Pre-warm request failed: {error}")
+                            return False
+                except asyncio.TimeoutError:
+                    if attempt < max_retries - 1:
+                        logger.debug(f"Pre-warm timeout, retrying...")
+                        await asyncio.sleep(retry_delay)
+                        continue
+                    raise
 
             return False
 
@@ -720,21 +808,27 @@ class LlamaCppClient:
 
         return await self._prewarm_cache(server, system_prompt)
 
-    @asynccontextmanager
-    async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create an aiohttp session."""
-        if not self._session:
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Get the shared aiohttp session, creating it on first use.
+
+        Health probes, KV-cache warm-up and completions all go through this
+        one session, so its connection pool keeps llama-server connections
+        alive between requests instead of reconnecting every time.
+
+        Returns:
+            The client's long-lived session
+        """
+        if self._session is None or self._session.closed:
+            # Servers are addressed by IP, so the connector never resolves DNS
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_POOL_LIMIT,
+                limit_per_host=HTTP_POOL_LIMIT_PER_HOST
+            )
             self._session = aiohttp.ClientSession(
+                connector=connector,
                 timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT)
             )
-        try:
-            yield self._session
-        except Exception as e:
-            logger.error(f"Session error: {e}")
-            if self._session:
-                await self._session.close()
-                self._session = None
-            raise
+        return self._session
 
     async def generate(
         self,
@@ -846,94 +940,92 @@ class LlamaCppClient:
                 "top_p": top_p,
                 "top_k": top_k,
                 "max_tokens": max_tokens,
-                "stop": [] if json_mode else ["<|im_end|>", "<|im_start|>", "<think>", "</think>"],
+                "stop": [] if json_mode else list(_RESPONSE_MARKERS),
                 "cache_prompt": True  # Enable KV cache reuse for common prompt prefix
             }
             
             # Only include grammar in request if json_mode is True AND no grammar file is specified
             # When using a grammar file, the server is already configured with it
             if json_mode and not grammar_file:
-                request_data["grammar"] = self.get_grammar('json').strip()
+                request_data["grammar"] = self._get_json_grammar()
 
             # Log the prompt being sent (truncated for readability)
             prompt_preview = formatted_prompt[-200:] if len(formatted_prompt) > 200 else formatted_prompt
             logger.info(f"Sending to LLM: ...{prompt_preview}")
 
             # Make request to server
-            async with self._get_session() as session:
-                async with session.post(
-                    f"http://{server.host}:{server.port}/completion",
-                    json=request_data
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise Exception(f"Server error: {error_text}")
+            session = self._ensure_session()
+            async with session.post(
+                f"http://{server.host}:{server.port}/completion",
+                json=request_data
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise Exception(f"Server error: {error_text}")
                     
-                    result = await response.json()
-
-                    # Log the full result for debugging
-                    logger.debug(f"Server response result: {result}")
-
-                    # Try multiple fields for response text (different llama-server versions use different field names)
-                    response_text = result.get("content") or result.get("text") or result.get("completion") or ""
-
-                    # Log if content is empty
-                    if not response_text:
-                        logger.warning(f"Empty content in server response. Full result keys: {result.keys()}")
-                        logger.warning(f"Full result: {result}")
-
-                    # Clean up the response
-                    response_text = response_text.strip()
-
-                    # Log the raw LLM response for debugging
-                    logger.info(f"LLM raw response: {response_text[:200]}{'...' if len(response_text) > 200 else ''}")
-
-                    if json_mode:
-                        # JSON mode: validate and clean JSON response
-                        try:
-                            # Attempt to parse as JSON to validate structure
-                            parsed_json = json.loads(response_text)
-                            # If successful, use the original response (preserves formatting)
-                            response_text = response_text
-                        except json.JSONDecodeError as e:
-                            logger.warning(f"Invalid JSON response from model: {e}")
-                            # Try to extract JSON from response if wrapped in other text
-                            import re
-                            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                            if json_match:
-                                try:
-                                    parsed_json = json.loads(json_match.group())
-                                    response_text = json_match.group()
-                                except json.JSONDecodeError:
-                                    # Fallback: return structured error as valid JSON
-                                    response_text = '{"error": "Invalid JSON generated by model", "raw_response": "' + response_text.replace('"', '\\"') + '"}'
-                            else:
-                                # No JSON found, return error response
-                                response_text = '{"error": "No JSON found in model response", "raw_response": "' + response_text.replace('"', '\\"') + '"}'
-                    else:
-                        # Free-form mode: remove conversation markers and clean whitespace
-                        for marker in ["<|im_end|>", "<|im_start|>", "<think>", "</think>"]:
-                            response_text = response_text.replace(marker, "")
-                        # Clean up whitespace
-                        response_text = ' '.join(response_text.split())
+                result = await response.json()
+
+                # Log the full result for debugging
+                logger.debug(f"Server response result: {result}")
+
+                # Try multiple fields for response text (different llama-server versions use different field names)
+                response_text = result.get("content") or result.get("text") or result.get("completion") or ""
+
+                # Log if content is empty
+                if not response_text:
+                    logger.warning(f"Empty content in server response. Full result keys: {result.keys()}")
+                    logger.warning(f"Full result: {result}")
+
+                # Clean up the response
+                response_text = response_text.strip()
+
+                # Log the raw LLM response for debugging
+                logger.info(f"LLM raw response: {response_text[:200]}{'...' if len(response_text) > 200 else ''}")
+
+                if json_mode:
+                    # JSON mode: validate and clean JSON response
+                    try:
+                        # Attempt to parse as JSON to validate structure
+                        parsed_json = json.loads(response_text)
+                        # If successful, use the original response (preserves formatting)
+                        response_text = response_text
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"Invalid JSON response from model: {e}")
+                        # Try to extract JSON from response if wrapped in other text
+                        json_match = _JSON_OBJECT_RE.search(response_text)
+                        if json_match:
+                            try:
+                                parsed_json = json.loads(json_match.group())
+                                response_text = json_match.group()
+                            except json.JSONDecodeError:
+                                # Fallback: return structured error as valid JSON
+                                response_text = '{"error": "Invalid JSON generated by model", "raw_response": "' + response_text.replace('"', '\\"') + '"}'
+                        else:
+                            # No JSON found, return error response
+                            response_text = '{"error": "No JSON found in model response", "raw_response": "' + response_text.replace('"', '\\"') + '"}'
+                else:
+                    # Free-form mode: remove conversation markers and clean whitespace
+                    response_text = _RESPONSE_MARKER_RE.sub("", response_text)
+                    # Clean up whitespace
+                    response_text = ' '.join(response_text.split())
                     
-                    if not response_text:
-                        logger.warning("Empty response from model")
-                        response_text = "No response generated"
+                if not response_text:
+                    logger.warning("Empty response from model")
+                    response_text = "No response generated"
                     
-                    return PromptResponse(
-                        text=response_text,
-                        model=model,
-                        temperature=temperature,
-                        top_p=top_p,
-                        top_k=top_k,
-                        max_tokens=max_tokens,
-                        json_mode=json_mode,
-                        system_prompt=system_prompt,
-                        prompt=prompt,
-                        generated_at=start_time,
-                        response_time=asyncio.get_event_loop().time() - start_time
-                    )
+                return PromptResponse(
+                    text=response_text,
+                    model=model,
+                    temperature=temperature,
+                    top_p=top_p,
+                    top_k=top_k,
+                    max_tokens=max_tokens,
+                    json_mode=json_mode,
+                    system_prompt=system_prompt,
+                    prompt=prompt,
+                    generated_at=start_time,
+                    response_time=asyncio.get_event_loop().time() - start_time
+                )
                     
         except Exception as e:
             logger.error(f"Generation error: {str(e)}")
@@ -1072,6 +1164,12 @@ class LlamaCppClient:
             raise ValueError(f"Grammar '{grammar_name}' not found in configuration")
         return self.grammars[grammar_name]['grammar']
         
+    def _get_json_grammar(self) -> str:
+        """Get the JSON grammar without surrounding whitespace, stripped once per process."""
+        if LlamaCppClient._json_grammar is None:
+            LlamaCppClient._json_grammar = self.get_grammar('json').strip()
+        return LlamaCppClient._json_grammar
+
     def get_grammar_info(self, grammar_name: str) -> Dict[str, Any]:
         """Get additional information about a grammar from the cached grammars."""
         if grammar_name not in self.grammars:
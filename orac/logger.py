@@ -117,8 +117,8 @@ class LoggerAdapter(logging.LoggerAdapter):
     def process(self, msg, kwargs):
         extra = kwargs.get("extra", {})
         
-        # Add context from the adapter
-        if hasattr(self, "extra") and isinstance(self.extra, dict):
+        # Add context from the adapter (logging.LoggerAdapter always sets self.extra)
+        if isinstance(self.extra, dict):
             for key, value in self.extra.items():
                 if key not in extra:
                     extra[key] = value
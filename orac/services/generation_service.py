@@ -14,9 +14,10 @@ Handles:
 
 import os
 import json
+import asyncio
 import re
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 from fastapi import HTTPException
 
@@ -26,7 +27,7 @@ from orac.models import GenerationRequest, GenerationResponse
 from orac.llama_cpp_client import LlamaCppClient
 from orac.topic_manager import TopicManager
 from orac.backend_manager import BackendManager
-from orac.backend_grammar_generator import BackendGrammarGenerator
+from orac.backend_grammar_generator import BackendGrammarGenerator, expand_alternation
 from orac.cache import STTResponseCache
 
 logger = get_logger(__name__)
@@ -35,6 +36,11 @@ logger = get_logger(__name__)
 class GenerationService:
     """Service for handling text generation with topic support and backend execution."""
 
+    # Class-level cache of parsed grammar options, keyed by grammar path and
+    # holding the file mtime they were parsed at. Services are created per
+    # request, so the cache must outlive the instance.
+    _grammar_options_cache: Dict[str, Tuple[int, Dict[str, list]]] = {}
+
     def __init__(
         self,
         client: LlamaCppClient,
@@ -155,8 +161,11 @@ class GenerationService:
                     detail=f"Topic '{topic_id}' is disabled"
                 )
 
-            # Mark topic as used
-            self.topic_manager.mark_topic_used(topic_id)
+            # Mark topic as used; this rewrites topics.yaml, so keep the disk
+            # write off the event loop
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.topic_manager.mark_topic_used, topic_id
+            )
 
             # Get the model from topic or request
             model_to_use = request.model or topic.model
@@ -370,31 +379,41 @@ class GenerationService:
         return grammar_file
 
     def _parse_grammar_options(self, grammar_file: str) -> Dict[str, list]:
-        """Parse GBNF grammar file to extract device and location options."""
+        """Parse GBNF grammar file to extract device and location options.
+
+        Results are cached until the grammar file's mtime changes, so the file
+        is only read and parsed again after it has been regenerated.
+        """
         options = {"devices": [], "locations": [], "actions": []}
         try:
+            mtime = os.stat(grammar_file).st_mtime_ns
+            cached = GenerationService._grammar_options_cache.get(grammar_file)
+            if cached and cached[0] == mtime:
+                return cached[1]
+
             with open(grammar_file, 'r') as f:
                 content = f.read()
 
             # Parse device ::= "option1" | "option2" | ...
             device_match = re.search(r'device\s*::=\s*(.+?)(?:\n|$)', content)
             if device_match:
-                devices = re.findall(r'"([^"]+)"', device_match.group(1))
-                options["devices"] = [d for d in devices if d != "UNKNOWN"]
+                devices = expand_alternation(device_match.group(1))
+                options["devices"] = [d for d in devices if d and d != "UNKNOWN"]
 
             # Parse location ::= "option1" | "option2" | ...
             location_match = re.search(r'location\s*::=\s*(.+?)(?:\n|$)', content)
             if location_match:
-                locations = re.findall(r'"([^"]+)"', location_match.group(1))
-                options["locations"] = [l for l in locations if l != "UNKNOWN"]
+                locations = expand_alternation(location_match.group(1))
+                options["locations"] = [l for l in locations if l and l != "UNKNOWN"]
 
             # Parse action ::= "option1" | "option2" | ...
             action_match = re.search(r'action\s*::=\s*(.+?)(?:\n|$)', content)
             if action_match:
-                actions = re.findall(r'"([^"]+)"', action_match.group(1))
-                options["actions"] = [a for a in actions if a != "UNKNOWN"]
+                actions = expand_alternation(action_match.group(1))
+                options["actions"] = [a for a in actions if a and a != "UNKNOWN"]
 
             logger.debug(f"Parsed grammar options: {options}")
+            GenerationService._grammar_options_cache[grammar_file] = (mtime, options)
         except Exception as e:
             logger.warning(f"Failed to parse grammar file: {e}")
 
@@ -1,7 +1,8 @@
 import os
+import threading
 import yaml
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Tuple
 from datetime import datetime
 import logging
 
@@ -10,6 +11,10 @@ from orac.topic_models.topic import Topic, TopicSettings, GrammarConfig
 
 logger = logging.getLogger(__name__)
 
+# libyaml-backed loader/dumper when PyYAML was built with it, pure Python otherwise
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
 
 class TopicManager:
     """Manages topic configurations and operations.
@@ -50,6 +55,12 @@ class TopicManager:
         self.topics_file = self.data_dir / "topics.yaml"
         self.topics: Dict[str, Topic] = {}
 
+        # Serializes topics.yaml writes, which may run from worker threads
+        self._save_lock = threading.Lock()
+
+        # (mtime_ns, size) of model_configs.yaml and the model names parsed from it
+        self._model_names_cache: Optional[Tuple[Tuple[int, int], list]] = None
+
         # Ensure data directory exists
         self.data_dir.mkdir(exist_ok=True)
 
@@ -80,7 +91,7 @@ class TopicManager:
 
         try:
             with open(self.topics_file, 'r') as f:
-                data = yaml.safe_load(f) or {}
+                data = yaml.load(f, Loader=_YAML_LOADER) or {}
                 topics_data = data.get('topics', {})
                 
                 logger.info(f"Found {len(topics_data)} topics in file")
@@ -134,7 +145,7 @@ class TopicManager:
         """Save topics to YAML file"""
         try:
             topics_data = {}
-            for topic_id, topic in self.topics.items():
+            for topic_id, topic in list(self.topics.items()):
                 topic_dict = topic.dict()
 
                 # Convert datetime objects to ISO format strings
@@ -146,11 +157,16 @@ class TopicManager:
             
             data = {'topics': topics_data}
             
-            # Log the complete data structure being saved
-            logger.info(f"Complete data being saved to YAML: {data}")
+            # Log the complete data structure being saved (formatted only when enabled)
+            logger.debug("Complete data being saved to YAML: %s", data)
             
-            with open(self.topics_file, 'w') as f:
-                yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+            # Write beside the real file and swap it in, so readers never see
+            # a half-written topics.yaml
+            tmp_file = self.topics_file.with_name(self.topics_file.name + '.tmp')
+            with self._save_lock:
+                with open(tmp_file, 'w') as f:
+                    yaml.dump(data, f, Dumper=_YAML_DUMPER, default_flow_style=False, sort_keys=False)
+                os.replace(tmp_file, self.topics_file)
             
             logger.info(f"Saved {len(self.topics)} topics to {self.topics_file}")
         except Exception as e:
@@ -385,14 +401,24 @@ class TopicManager:
         """
         model_configs_file = self.data_dir / "model_configs.yaml"
         
-        if not model_configs_file.exists():
+        try:
+            stat = model_configs_file.stat()
+        except OSError:
             return ["Qwen3-0.6B-Q8_0.gguf"]  # Default fallback
+
+        # Reuse the parsed model list until the file changes on disk
+        file_key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._model_names_cache
+        if cached and cached[0] == file_key:
+            return list(cached[1])
         
         try:
             with open(model_configs_file, 'r') as f:
-                data = yaml.safe_load(f) or {}
+                data = yaml.load(f, Loader=_YAML_LOADER) or {}
                 models = list(data.get('models', {}).keys())
-                return models if models else ["Qwen3-0.6B-Q8_0.gguf"]
+                models = models if models else ["Qwen3-0.6B-Q8_0.gguf"]
+                self._model_names_cache = (file_key, models)
+                return list(models)
         except Exception as e:
             logger.error(f"Failed to load available models: {e}")
             return ["Qwen3-0.6B-Q8_0.gguf"]
@@ -482,11 +508,20 @@ class TopicManager:
         grammar_exists = grammar_path.exists()
 
         # Get device statistics (device_mappings is a dict keyed by entity_id)
-        all_devices = list(backend.get("device_mappings", {}).values())
-        enabled_devices = [d for d in all_devices if d.get("enabled")]
-        mapped_devices = [d for d in enabled_devices if d.get("device_type") and d.get("location")]
-        device_types = list(set(d.get("device_type") for d in mapped_devices if d.get("device_type")))
-        locations = list(set(d.get("location") for d in mapped_devices if d.get("location")))
+        # in one pass over the values view, without intermediate lists
+        device_mappings = backend.get("device_mappings", {})
+        enabled_count = 0
+        mapped_count = 0
+        device_types = set()
+        locations = set()
+        for device in device_mappings.values():
+            if not device.get("enabled"):
+                continue
+            enabled_count += 1
+            if device.get("device_type") and device.get("location"):
+                mapped_count += 1
+                device_types.add(device["device_type"])
+                locations.add(device["location"])
 
         return {
             "backend_id": topic.backend_id,
@@ -494,9 +529,9 @@ class TopicManager:
             "type": backend.get("type", "unknown"),
             "status": backend.get("status", {}),
             "statistics": {
-                "total_devices": len(all_devices),
-                "enabled_devices": len(enabled_devices),
-                "mapped_devices": len(mapped_devices)
+                "total_devices": len(device_mappings),
+                "enabled_devices": enabled_count,
+                "mapped_devices": mapped_count
             },
             "device_types": sorted(device_types),
             "locations": sorted(locations),
@@ -8,15 +8,18 @@ This script tests the Sprint 3 grammar generation functionality with mock data.
 import os
 import sys
 import json
+import asyncio
 import tempfile
 import shutil
 from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
 
 # Add the orac package to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
 
 from orac.backend_manager import BackendManager
-from orac.backend_grammar_generator import BackendGrammarGenerator
+from orac.backend_grammar_generator import BackendGrammarGenerator, expand_alternation
 
 
 def create_test_backend_data(backend_manager, data_dir):
@@ -191,6 +194,56 @@ def test_command_validation(grammar_generator, backend_id):
                 print(f"   - Found location: {result['found_location']}")
 
 
+def test_large_vocabulary_alternation():
+    """Test that prefix-tree alternations match exactly the configured values."""
+    print("\n🌳 Testing prefix-tree alternation for large vocabularies")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        grammar_generator = BackendGrammarGenerator(BackendManager(data_dir=temp_dir), data_dir=temp_dir)
+
+        locations = {f"room {i}" for i in range(40)} | {"bedroom", "bed", 'say "hi"', "back\\slash"}
+        alternation = grammar_generator._generate_alternation(locations)
+        print(f"   - Alternation: {alternation[:80]}...")
+
+        assert alternation.startswith('"b')
+        assert sorted(expand_alternation(alternation)) == sorted(locations)
+
+        small = {"lights", "heating", "UNKNOWN"}
+        assert grammar_generator._generate_alternation(small) == '"UNKNOWN" | "heating" | "lights"'
+        assert sorted(expand_alternation(grammar_generator._generate_alternation(small))) == sorted(small)
+
+
+def test_grammar_options_route_with_prefix_tree():
+    """Test that the grammar-options route expands prefix-tree alternations."""
+    print("\n🧭 Testing grammar-options route with a prefix-tree grammar")
+
+    from orac import api_topics
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        grammar_generator = BackendGrammarGenerator(BackendManager(data_dir=temp_dir), data_dir=temp_dir)
+
+        locations = {f"room {i}" for i in range(40)} | {"bathroom", "bedroom", "UNKNOWN"}
+        devices = {"lights", "heating", "UNKNOWN"}
+        grammar_generator.get_grammar_file_path("trie").write_text(
+            f"device ::= {grammar_generator._generate_alternation(devices)}\n"
+            f"location ::= {grammar_generator._generate_alternation(locations)}\n"
+            'action ::= "on" | "off"\n'
+        )
+
+        topic = SimpleNamespace(backend_id="trie")
+        with mock.patch.dict(os.environ, {"DATA_DIR": temp_dir}), \
+                mock.patch.object(api_topics.topic_manager, "get_topic", return_value=topic):
+            response = asyncio.run(api_topics.get_topic_grammar_options("test"))
+
+        print(f"   - Locations: {len(response.locations)}")
+
+        assert response.has_grammar
+        assert sorted(response.devices) == ["heating", "lights"]
+        assert sorted(response.locations) == sorted(locations - {"UNKNOWN"})
+        assert response.actions == ["on", "off"]
+        assert "bathroom" in response.auto_prompt and " | " not in response.auto_prompt
+
+
 def main():
     """Main test function."""
     print("🚀 Testing BackendGrammarGenerator (Sprint 3)")
@@ -214,6 +267,9 @@ def main():
             # Test command validation
             test_command_validation(grammar_generator, backend_id)
 
+        test_large_vocabulary_alternation()
+        test_grammar_options_route_with_prefix_tree()
+
         print("\n" + "=" * 60)
         print("🎉 Test completed!")
 
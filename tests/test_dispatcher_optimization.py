@@ -6,8 +6,11 @@ Test script for the dispatcher and grammar optimization implementation.
 import os
 import sys
 import json
+import time
 import logging
 from pathlib import Path
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -15,6 +18,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from orac.grammars import GBNFParser
 from orac.dispatchers.mapping_generator import MappingGenerator
 from orac.dispatchers.mapping_resolver import MappingResolver
+from orac.dispatchers import homeassistant as ha_dispatcher
 from orac.dispatchers.homeassistant import HomeAssistantDispatcher
 from orac.core import TimedCommand, command_history
 
@@ -167,6 +171,80 @@ def test_homeassistant_dispatcher():
     return result['success']
 
 
+def test_duplicate_command_suppression():
+    """Test that repeated idempotent commands are answered from recent results."""
+    print("\n" + "="*60)
+    print("Testing Duplicate Command Suppression")
+    print("="*60)
+
+    config = {
+        "ha_url": "http://ha.test:8123",
+        "device_mappings": {"lights/lounge": {"entity_id": "light.lounge"}}
+    }
+    context = {"topic_id": "test_duplicate_commands"}
+
+    # One dispatcher shared by every command, as HomeAssistantBackend holds it
+    dispatcher = HomeAssistantDispatcher(config)
+
+    def run(action):
+        command = json.dumps({"device": "lights", "action": action, "location": "lounge"})
+        return dispatcher.execute(command, context)
+
+    # Skip the dispatcher's state propagation delay but keep a real pause
+    pause = time.sleep
+    ha_dispatcher._recent_commands.clear()
+    with mock.patch.object(HomeAssistantDispatcher, "_call_ha_service", return_value={}) as call_service, \
+            mock.patch.object(HomeAssistantDispatcher, "_get_entity_state", return_value={"state": "on"}), \
+            mock.patch.object(ha_dispatcher, "_DUPLICATE_WINDOW_SECONDS", 0.2), \
+            mock.patch.object(ha_dispatcher.time, "sleep"):
+        first = run("on")
+        second = run("on")
+        assert first["success"] and second == first
+        assert call_service.call_count == 1
+        print("✓ Repeat within the window reused the previous result")
+
+        run("off")
+        run("on")
+        assert call_service.call_count == 3
+        print("✓ On after off within the window called Home Assistant again")
+
+        run("toggle")
+        run("toggle")
+        run("on")
+        assert call_service.call_count == 6
+        print("✓ Non-idempotent service was called every time and superseded the cache")
+
+        pause(0.25)
+        run("on")
+        assert call_service.call_count == 7
+        print("✓ Repeat after the window called Home Assistant again")
+
+        # Concurrent commands on the shared dispatcher, as the backend runs
+        # them in executor threads
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(run, ["off"] * 4))
+        assert all(result["success"] for result in results)
+        calls = call_service.call_count
+        assert 8 <= calls <= 11
+        run("off")
+        assert call_service.call_count == calls
+        run("on")
+        assert call_service.call_count == calls + 1
+        print("✓ Concurrent commands on one dispatcher kept the cache consistent")
+
+    ha_dispatcher._recent_commands.clear()
+    for i in range(ha_dispatcher._DUPLICATE_CACHE_SIZE + 1):
+        ha_dispatcher._remember_result(("target", i), "turn_on", {"success": True})
+    assert len(ha_dispatcher._recent_commands) == ha_dispatcher._DUPLICATE_CACHE_SIZE
+    assert ha_dispatcher._get_recent_result(("target", 0), "turn_on") is None
+    assert ha_dispatcher._get_recent_result(("target", 1), "turn_on") == {"success": True}
+    assert ha_dispatcher._get_recent_result(("target", 1), "turn_off") is None
+    ha_dispatcher._recent_commands.clear()
+    print("✓ Oldest entry evicted when the cache is full")
+
+    return True
+
+
 def test_timing_infrastructure():
     """Test the timing infrastructure."""
     print("\n" + "="*60)
@@ -230,6 +308,7 @@ def main():
         ("Mapping Generator", test_mapping_generator),
         ("Mapping Resolver", test_mapping_resolver),
         ("HomeAssistant Dispatcher", test_homeassistant_dispatcher),
+        ("Duplicate Command Suppression", test_duplicate_command_suppression),
         ("Timing Infrastructure", test_timing_infrastructure)
     ]
 
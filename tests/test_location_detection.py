@@ -8,6 +8,8 @@ showing how it enables room-based commands like "turn off everything in the bedr
 
 import asyncio
 import logging
+from collections import defaultdict
+from itertools import islice
 from orac.homeassistant.client import HomeAssistantClient
 from orac.homeassistant.config import HomeAssistantConfig
 from orac.homeassistant.location_detector import LocationDetector
@@ -32,11 +34,13 @@ async def test_location_detection():
         
         print("1. Fetching Home Assistant data...")
         
-        # Get all required data
-        entities = await client.get_states()
-        areas = await client.get_areas()
-        entity_registry = await client.get_entity_registry()
-        device_registry = await client.get_device_registry()
+        # Get all required data (independent requests, fetched concurrently)
+        entities, areas, entity_registry, device_registry = await asyncio.gather(
+            client.get_states(),
+            client.get_areas(),
+            client.get_entity_registry(),
+            client.get_device_registry()
+        )
         
         print(f"   - Found {len(entities)} entities")
         print(f"   - Found {len(areas)} areas")
@@ -64,15 +68,17 @@ async def test_location_detection():
         # Filter for relevant entities
         print("\n3. Filtering relevant entities...")
         
+        is_supported_domain = domain_mapper.is_supported_domain
+        determine_device_type = domain_mapper.determine_device_type
+        
         relevant_entities = []
         for entity in entities:
-            entity_id = entity['entity_id']
-            domain = entity_id.split('.')[0]
+            domain = entity['entity_id'].partition('.')[0]
             
-            if not domain_mapper.is_supported_domain(domain):
+            if not is_supported_domain(domain):
                 continue
             
-            device_type = domain_mapper.determine_device_type(entity, domain)
+            device_type = determine_device_type(entity, domain)
             if device_type:
                 relevant_entities.append(entity)
         
@@ -81,23 +87,20 @@ async def test_location_detection():
         # Test location detection
         print("\n4. Testing location detection...")
         
-        location_results = {}
+        location_results = defaultdict(list)
         entities_with_locations = 0
-        entities_without_locations = 0
+        detect_location = detector.detect_location
         
         for entity in relevant_entities:
-            entity_id = entity['entity_id']
-            location = detector.detect_location(
+            location = detect_location(
                 entity, entity_area_map, device_area_map, areas, entity_registry
             )
             
             if location:
                 entities_with_locations += 1
-                if location not in location_results:
-                    location_results[location] = []
-                location_results[location].append(entity_id)
-            else:
-                entities_without_locations += 1
+                location_results[location].append(entity['entity_id'])
+        
+        entities_without_locations = len(relevant_entities) - entities_with_locations
         
         print(f"   - Entities with locations: {entities_with_locations}")
         print(f"   - Entities without locations: {entities_without_locations}")
@@ -106,7 +109,7 @@ async def test_location_detection():
         print("\n5. Location breakdown:")
         for location, entity_ids in sorted(location_results.items()):
             print(f"   - {location}: {len(entity_ids)} entities")
-            for entity_id in entity_ids[:3]:  # Show first 3
+            for entity_id in islice(entity_ids, 3):  # Show first 3
                 print(f"     • {entity_id}")
             if len(entity_ids) > 3:
                 print(f"     • ... and {len(entity_ids) - 3} more")
@@ -127,7 +130,7 @@ async def test_location_detection():
             print(f"   - {location}:")
             for device_type, entity_ids in device_types.items():
                 print(f"     • {device_type}: {len(entity_ids)} entities")
-                for entity_id in entity_ids[:2]:  # Show first 2
+                for entity_id in islice(entity_ids, 2):  # Show first 2
                     print(f"       - {entity_id}")
                 if len(entity_ids) > 2:
                     print(f"       - ... and {len(entity_ids) - 2} more")
@@ -174,5 +177,20 @@ async def test_location_detection():
         print(f"\n✅ Location detection test complete!")
         print(f"   The system is now ready for room-based voice commands!")
 
+def test_device_area_with_multiple_registry_rows():
+    """Test that the device area is found when the first registry row has no device."""
+    detector = LocationDetector()
+    entity = {'entity_id': 'light.ceiling', 'attributes': {'friendly_name': 'Ceiling'}}
+    entity_registry = [
+        {'entity_id': 'light.ceiling', 'name': None},
+        {'entity_id': 'light.ceiling', 'device_id': 'device_1', 'name': 'Ceiling Light'},
+    ]
+    
+    location = detector.detect_location(
+        entity, {}, {'device_1': 'area_1'}, {'area_1': 'Kitchen'}, entity_registry
+    )
+    
+    assert location == 'kitchen'
+
 if __name__ == "__main__":
     asyncio.run(test_location_detection()) 
\ No newline at end of file